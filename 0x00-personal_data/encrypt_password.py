@@ -3,21 +3,32 @@
 encrypt_password
 """
 
+import os
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
 import bcrypt
 
 
-def hash_password(password: str) -> bytes:
+BCRYPT_ROUNDS = 12
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+
+
+def hash_password(password: str, rounds: int = None) -> bytes:
     """
     Hash a password using bcrypt.
 
     Args:
         password (str): The plain-text password to be hashed.
+        rounds (int): The bcrypt cost factor, defaults to BCRYPT_ROUNDS.
 
     Returns:
         bytes: The salted, hashed password as a byte string.
     """
     return bcrypt.hashpw(password.encode('utf-8'),
-                         salt=bcrypt.gensalt())
+                         salt=bcrypt.gensalt(rounds or BCRYPT_ROUNDS))
 
 
 def is_valid(hashed_password: bytes, password: str) -> bool:
@@ -33,3 +44,125 @@ def is_valid(hashed_password: bytes, password: str) -> bool:
               False otherwise.
     """
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password)
+
+
+def calibrate_rounds(target_ms: float = 100, sample_rounds: int = 8,
+                     samples: int = 5) -> int:
+    """
+    Pick the highest bcrypt cost factor whose hashing time stays within
+    a target latency on the current machine.
+
+    Each extra round doubles the hashing time, so hashes are timed at
+    ``sample_rounds`` and the best time is extrapolated, which filters
+    out samples slowed down by other load.
+
+    Args:
+        target_ms (float): The target hashing latency in milliseconds.
+        sample_rounds (int): The cost factor of the timed hashes.
+        samples (int): The number of timed hashes.
+
+    Returns:
+        int: The calibrated cost factor, between MIN_ROUNDS and MAX_ROUNDS.
+    """
+    salt = bcrypt.gensalt(sample_rounds)
+    timings = []
+    for _ in range(max(1, samples)):
+        start = time.perf_counter()
+        bcrypt.hashpw(b'calibration', salt)
+        timings.append(time.perf_counter() - start)
+    elapsed_ms = min(timings) * 1000
+
+    rounds = sample_rounds + math.floor(math.log2(target_ms / elapsed_ms))
+    return max(MIN_ROUNDS, min(MAX_ROUNDS, rounds))
+
+
+def needs_rehash(hashed_password: bytes, rounds: int = None) -> bool:
+    """
+    Check if a hashed password was made with another cost factor.
+
+    Args:
+        hashed_password (bytes): The stored hashed password.
+        rounds (int): The expected bcrypt cost factor, defaults to
+                      BCRYPT_ROUNDS.
+
+    Returns:
+        bool: True if the password should be hashed again,
+              False otherwise.
+    """
+    try:
+        cost = int(hashed_password.split(b'$')[2])
+    except (IndexError, ValueError):
+        return True
+    return cost != (rounds or BCRYPT_ROUNDS)
+
+
+def verify_and_upgrade(hashed_password: bytes, password: str,
+                       rounds: int = None) -> Tuple[bool, Optional[bytes]]:
+    """
+    Check a plain-text password and rehash it if its hash is outdated.
+
+    Args:
+        hashed_password (bytes): The stored hashed password.
+        password (str): The plain-text password to be validated.
+        rounds (int): The expected bcrypt cost factor, defaults to
+                      BCRYPT_ROUNDS.
+
+    Returns:
+        Tuple[bool, Optional[bytes]]: Whether the password is valid, and
+                                      the new hash to store if it was
+                                      rehashed, None otherwise; a
+                                      malformed hash is not valid.
+    """
+    try:
+        if not is_valid(hashed_password, password):
+            return False, None
+    except ValueError:
+        return False, None
+    if needs_rehash(hashed_password, rounds):
+        return True, hash_password(password, rounds)
+    return True, None
+
+
+def hash_passwords(passwords: Iterable[str]) -> List[bytes]:
+    """
+    Hash many passwords using bcrypt across a thread pool.
+
+    bcrypt releases the GIL while hashing, so the work spreads over
+    one thread per CPU.
+
+    Args:
+        passwords (Iterable[str]): The plain-text passwords to be hashed.
+
+    Returns:
+        List[bytes]: The salted, hashed passwords, in input order.
+    """
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(hash_password, passwords))
+
+
+def _is_valid_pair(pair: Tuple[bytes, str]) -> bool:
+    """
+    Check a (hashed_password, password) pair, a malformed hash being
+    a mismatch rather than an error.
+    """
+    try:
+        return is_valid(*pair)
+    except ValueError:
+        return False
+
+
+def verify_many(pairs: Iterable[Tuple[bytes, str]]) -> List[bool]:
+    """
+    Check many plain-text passwords against their hashes across
+    a thread pool. A malformed hash only fails its own pair.
+
+    Args:
+        pairs (Iterable[Tuple[bytes, str]]): The (hashed_password, password)
+                                             pairs to be validated.
+
+    Returns:
+        List[bool]: Whether each password matches its hash, in input order,
+                    False for a malformed hash.
+    """
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return list(executor.map(_is_valid_pair, pairs))
@@ -4,12 +4,141 @@ filtered_logger: A module for logging with data redaction functionality.
 """
 import os
 import re
+import csv
+import time
+import atexit
 import logging
-from typing import List
+import argparse
+from mmap import mmap, ACCESS_READ
+from io import StringIO
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+from typing import Dict, Iterable, Iterator, List, TextIO, Tuple
 import mysql.connector
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import MySQLConnectionPool
 
 
 PII_FIELDS = ('name', 'email', 'phone', 'ssn', 'password')
+REDACTOR_CACHE_SIZE = 128
+BATCH_SIZE = 1000
+LOG_QUEUE_SIZE = 10000
+LOG_QUEUE_TIMEOUT = 0.1
+CSV_CHUNK_LINES = 10000
+CSV_CHUNK_BYTES = 4 * 1024 * 1024
+DB_POOL_SIZE = 5
+DB_TIMEOUT = 10
+DB_POOL_TIMEOUT = 5
+
+
+class Redactor:
+    """
+    Redaction engine holding a precompiled pattern for one
+    (fields, redaction, separator) combination.
+
+    Attributes:
+        fields (Tuple[str, ...]): The field names to redact.
+        redaction (str): The string used for redacting sensitive information.
+        separator (str): The separator used to identify key-value
+                         pairs in log messages.
+    """
+
+    def __init__(self, fields: Tuple[str, ...], redaction: str,
+                 separator: str):
+        """
+        Initialize the Redactor and compile its pattern.
+
+        Args:
+            fields (Tuple[str, ...]): The field names to redact.
+            redaction (str): The string to replace redacted information.
+            separator (str): The separator used to identify key-value pairs.
+        """
+        self.fields = tuple(fields)
+        self.redaction = redaction
+        self.separator = separator
+        self._pattern = re.compile(
+            r'({})=[^{}]+'.format('|'.join(self.fields), separator))
+        self._replacement = r'\1={}'.format(redaction)
+
+    def redact(self, message: str) -> str:
+        """
+        Obfuscate the configured fields within a log message.
+
+        Args:
+            message (str): The log message containing sensitive information.
+
+        Returns:
+            str: The log message with the configured fields redacted.
+        """
+        return self._pattern.sub(self._replacement, message)
+
+
+class TokenRedactor(Redactor):
+    """
+    Single-pass, non-regex redaction engine for structured
+    ``key=value<separator>key=value`` log lines.
+
+    The message is split on the separator once and each key is looked
+    up in a frozenset of the fields to redact.
+    """
+
+    def __init__(self, fields: Tuple[str, ...], redaction: str,
+                 separator: str):
+        """
+        Initialize the TokenRedactor.
+
+        Args:
+            fields (Tuple[str, ...]): The field names to redact.
+            redaction (str): The string to replace redacted information.
+            separator (str): The separator used to identify key-value pairs.
+        """
+        self.fields = tuple(fields)
+        self.redaction = redaction
+        self.separator = separator
+        self._lookup = frozenset(self.fields)
+
+    def redact(self, message: str) -> str:
+        """
+        Obfuscate the configured fields within a key=value log line.
+
+        Args:
+            message (str): The log line containing sensitive information.
+
+        Returns:
+            str: The log line with the configured fields redacted.
+        """
+        lookup = self._lookup
+        tokens = message.split(self.separator)
+        for i, token in enumerate(tokens):
+            key, _, value = token.partition('=')
+            if value and key.lstrip() in lookup:
+                tokens[i] = '{}={}'.format(key, self.redaction)
+        return self.separator.join(tokens)
+
+
+@lru_cache(maxsize=REDACTOR_CACHE_SIZE)
+def get_redactor(fields: Tuple[str, ...], redaction: str,
+                 separator: str, tokenize: bool = False) -> Redactor:
+    """
+    Get a compiled Redactor, reusing one from a bounded LRU cache.
+
+    Args:
+        fields (Tuple[str, ...]): The field names to redact.
+        redaction (str): The string to replace redacted information.
+        separator (str): The separator used to identify key-value pairs.
+        tokenize (bool): Use the single-pass TokenRedactor instead of
+                         the regex engine.
+
+    Returns:
+        Redactor: The redactor for the given combination.
+    """
+    if tokenize:
+        return TokenRedactor(fields, redaction, separator)
+    return Redactor(fields, redaction, separator)
 
 
 class RedactingFormatter(logging.Formatter):
@@ -28,16 +157,37 @@ class RedactingFormatter(logging.Formatter):
     FORMAT = "[HOLBERTON] %(name)s %(levelname)s %(asctime)-15s: %(message)s"
     SEPARATOR = ";"
 
-    def __init__(self, fields: List[str]):
+    def __init__(self, fields: List[str], tokenize: bool = False):
         """
         Initialize the RedactingFormatter.
 
         Args:
             fields (List[str]): A list of field names representing sensitive
                                 information to redact.
+            tokenize (bool): Redact the record message with the single-pass
+                             TokenRedactor before formatting, instead of
+                             regex-redacting the whole formatted line.
         """
         super(RedactingFormatter, self).__init__(self.FORMAT)
         self.fields = fields
+        self.tokenize = tokenize
+        self.redactor = get_redactor(tuple(fields), self.REDACTION,
+                                     self.SEPARATOR, tokenize)
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        """
+        Format the message part of a log record, redacting it first
+        when tokenizing.
+
+        Args:
+            record (logging.LogRecord): The log record to be formatted.
+
+        Returns:
+            str: The formatted log message.
+        """
+        if self.tokenize:
+            record.message = self.redactor.redact(record.message)
+        return super(RedactingFormatter, self).formatMessage(record)
 
     def format(self, record: logging.LogRecord) -> str:
         """
@@ -50,8 +200,105 @@ class RedactingFormatter(logging.Formatter):
             str: The formatted log message with redacted sensitive information.
         """
         message = super(RedactingFormatter, self).format(record)
-        return filter_datum(self.fields, self.REDACTION,
-                            message, self.SEPARATOR)
+        if self.tokenize:
+            return message
+        return self.redactor.redact(message)
+
+
+class RedactingFilter(logging.Filter):
+    """
+    Logging filter that masks sensitive fields of a structured record.
+
+    The row dict is taken from the ``row`` extra or, failing that, from
+    ``record.args`` and masked at the dict level, so no formatted string
+    ever has to be parsed back.
+
+    Attributes:
+        fields (frozenset): The field names to redact.
+        redaction (str): The string used for redacting sensitive information.
+    """
+
+    def __init__(self, fields: List[str],
+                 redaction: str = RedactingFormatter.REDACTION):
+        """
+        Initialize the RedactingFilter.
+
+        Args:
+            fields (List[str]): A list of field names representing sensitive
+                                information to redact.
+            redaction (str): The string to replace redacted information.
+        """
+        super(RedactingFilter, self).__init__()
+        self.fields = frozenset(fields)
+        self.redaction = redaction
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Mask the sensitive fields of the record's row, if it has one.
+
+        Args:
+            record (logging.LogRecord): The log record to be filtered.
+
+        Returns:
+            bool: Always True, records are never dropped.
+        """
+        row = getattr(record, 'row', None)
+        if row is None and isinstance(record.args, dict):
+            row = record.args
+        if row is not None and not getattr(record, 'row_redacted', False):
+            record.row = redact_row(self.fields, self.redaction, row)
+            record.row_redacted = True
+        return True
+
+
+class StructuredFormatter(RedactingFormatter):
+    """
+    Formatter serialising the row masked by RedactingFilter into a
+    single ``key=value; key=value`` line.
+
+    Records without a row are formatted and redacted as by
+    RedactingFormatter.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a log record, serialising its row once if it has one.
+
+        Args:
+            record (logging.LogRecord): The log record to be formatted.
+
+        Returns:
+            str: The formatted log message with redacted sensitive information.
+        """
+        row = getattr(record, 'row', None)
+        if row is None:
+            return super(StructuredFormatter, self).format(record)
+
+        if not getattr(record, 'row_redacted', False):
+            row = redact_row(self.fields, self.REDACTION, row)
+        line = '{} '.format(self.SEPARATOR).join(
+            "{}={}".format(field, value) for field, value in row.items())
+        # format a copy: other handlers share the original record
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = line
+        record.args = None
+        return logging.Formatter.format(self, record)
+
+
+def redact_row(fields: List[str], redaction: str, row: Dict) -> Dict:
+    """
+    Obfuscates specific fields within a row dict.
+
+    Args:
+        fields (List[str]): A list of field names to be redacted.
+        redaction (str): The string to replace redacted information.
+        row (Dict): The row containing sensitive information.
+
+    Returns:
+        Dict: A copy of the row with specified fields redacted.
+    """
+    return {field: redaction if field in fields else value
+            for field, value in row.items()}
 
 
 def filter_datum(fields: List[str], redaction: str,
@@ -69,26 +316,117 @@ def filter_datum(fields: List[str], redaction: str,
     Returns:
         str: The log message with specified fields redacted.
     """
-    return re.sub(r'({})=[^{}]+'.format('|'.join(fields), separator),
-                  r'\1={}'.format(redaction), message)
+    return get_redactor(tuple(fields), redaction, separator).redact(message)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue, handing records to a QueueListener
+    so redaction and I/O run on the listener's background thread.
+
+    When the queue is full a record waits up to ``timeout`` seconds for
+    room, then is dropped and counted.
+
+    Attributes:
+        timeout (float): Seconds to wait for room in a full queue.
+        enqueued (int): The number of records handed to the queue.
+        dropped (int): The number of records dropped on a full queue.
+        listener (QueueListener): The listener draining the queue, if any.
+    """
+
+    def __init__(self, queue: Queue, timeout: float = LOG_QUEUE_TIMEOUT):
+        """
+        Initialize the BoundedQueueHandler.
+
+        Args:
+            queue (Queue): The bounded queue records are put on.
+            timeout (float): Seconds to wait for room in a full queue.
+        """
+        super(BoundedQueueHandler, self).__init__(queue)
+        self.timeout = timeout
+        self.enqueued = 0
+        self.dropped = 0
+        self.listener = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Hand the record over untouched; formatting is left to the
+        listener's handlers instead of the logging thread.
+
+        Args:
+            record (logging.LogRecord): The log record to be queued.
+
+        Returns:
+            logging.LogRecord: The same log record.
+        """
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        """
+        Put a record on the queue, dropping it if the queue stays full.
 
+        Args:
+            record (logging.LogRecord): The log record to be queued.
+        """
+        try:
+            self.queue.put(record, timeout=self.timeout)
+        except Full:
+            self.dropped += 1
+        else:
+            self.enqueued += 1
 
-def get_logger() -> logging.Logger:
+
+def get_logger(structured: bool = False,
+               queued: bool = False) -> logging.Logger:
     """
     Get a configured logger instance for logging user data with redaction.
 
+    Each configuration gets its own logger: 'user_data' by default,
+    'user_data.structured', 'user_data.queued' or
+    'user_data.structured.queued' otherwise. A logger is configured on
+    the first call only; later calls return it unchanged instead of
+    stacking duplicate handlers.
+
+    Args:
+        structured (bool): Redact row dicts passed as ``record.args`` or
+                           ``extra={'row': ...}`` at the dict level with
+                           RedactingFilter and StructuredFormatter.
+        queued (bool): Redact and write records on a background thread
+                       behind a BoundedQueueHandler.
+
     Returns:
         logging.Logger: The configured logger instance.
     """
-    logger = logging.getLogger('user_data')
+    name = 'user_data'
+    if structured:
+        name += '.structured'
+    if queued:
+        name += '.queued'
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+
     logger.setLevel(logging.INFO)
     logger.propagate = False
 
-    formatter = RedactingFormatter(PII_FIELDS)
-
     stream_handler = logging.StreamHandler()
+    if structured:
+        formatter = StructuredFormatter(PII_FIELDS)
+        stream_handler.addFilter(RedactingFilter(PII_FIELDS))
+    else:
+        formatter = RedactingFormatter(PII_FIELDS)
     stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+
+    if queued:
+        queue_handler = BoundedQueueHandler(Queue(LOG_QUEUE_SIZE))
+        queue_handler.listener = QueueListener(queue_handler.queue,
+                                               stream_handler,
+                                               respect_handler_level=True)
+        queue_handler.listener.start()
+        atexit.register(queue_handler.listener.stop)
+        logger.addHandler(queue_handler)
+    else:
+        logger.addHandler(stream_handler)
 
     return logger
 
@@ -100,36 +438,443 @@ def get_db() -> mysql.connector.connection.MySQLConnection:
     Returns:
         Database connector object.
     """
+    return mysql.connector.connect(**db_config())
+
+
+def db_config() -> Dict:
+    """
+    Read the database connection settings from the environment.
+
+    Returns:
+        Dict: The connection arguments for mysql.connector.
+    """
     db_username = os.getenv("PERSONAL_DATA_DB_USERNAME") or "root"
     db_password = os.getenv("PERSONAL_DATA_DB_PASSWORD") or ""
     db_host = os.getenv("PERSONAL_DATA_DB_HOST") or "localhost"
     db_name = os.getenv("PERSONAL_DATA_DB_NAME")
 
-    return mysql.connector.connect(
-            user=db_username,
-            password=db_password,
-            host=db_host,
-            database=db_name
+    return {
+            'user': db_username,
+            'password': db_password,
+            'host': db_host,
+            'database': db_name
+            }
+
+
+@lru_cache(maxsize=None)
+def get_db_pool() -> MySQLConnectionPool:
+    """
+    Get the process-wide MySQL connection pool, creating it on first use.
+
+    The pool size and connection timeout in seconds are read from
+    PERSONAL_DATA_DB_POOL_SIZE and PERSONAL_DATA_DB_TIMEOUT.
+
+    Returns:
+        MySQLConnectionPool: The connection pool.
+    """
+    pool_size = int(os.getenv("PERSONAL_DATA_DB_POOL_SIZE") or DB_POOL_SIZE)
+    timeout = int(os.getenv("PERSONAL_DATA_DB_TIMEOUT") or DB_TIMEOUT)
+
+    return MySQLConnectionPool(
+            pool_name='user_data',
+            pool_size=pool_size,
+            connection_timeout=timeout,
+            **db_config()
             )
 
 
-def main():
+@contextmanager
+def pooled_db(pool: MySQLConnectionPool = None) -> Iterator:
+    """
+    Borrow a connection from the pool and return it on exit.
+
+    When every connection is in use, waits up to
+    PERSONAL_DATA_DB_POOL_TIMEOUT seconds for one to be returned.
+
+    Args:
+        pool (MySQLConnectionPool): The pool to borrow from, defaults to
+                                    get_db_pool().
+
+    Yields:
+        PooledMySQLConnection: The borrowed connection.
+
+    Raises:
+        PoolError: If no connection is returned before the timeout.
+    """
+    pool = pool or get_db_pool()
+    timeout = float(os.getenv("PERSONAL_DATA_DB_POOL_TIMEOUT")
+                    or DB_POOL_TIMEOUT)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            db_connection = pool.get_connection()
+            break
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.01)
+
+    try:
+        yield db_connection
+    finally:
+        db_connection.close()
+
+
+def stream_rows(db_connection: mysql.connector.connection.MySQLConnection,
+                query: str, batch_size: int = BATCH_SIZE) -> Iterator[Dict]:
+    """
+    Stream the rows of a query through an unbuffered dictionary cursor.
+
+    Args:
+        db_connection: The database connection to query.
+        query (str): The SQL query to execute.
+        batch_size (int): The number of rows fetched per round trip.
+
+    Yields:
+        Dict: Each row of the result, keyed by column name.
+    """
+    cursor = db_connection.cursor(dictionary=True, buffered=False)
+    try:
+        cursor.execute(query)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def main(batch_size: int = BATCH_SIZE):
     """
-    Obtain a database connection, retrieve all rows from the 'users' table,
-    and display each row in a filtered format. Print a list of filtered fields.
+    Obtain a database connection, stream the rows of the 'users' table,
+    and display each row in a filtered format as it arrives.
+
+    Args:
+        batch_size (int): The number of rows fetched per round trip.
     """
     db_connection = get_db()
-    cursor = db_connection.cursor()
-    cursor.execute("SELECT * FROM users")
-    rows = cursor.fetchall()
+    logger = get_logger(structured=True)
+
+    try:
+        for row in stream_rows(db_connection, "SELECT * FROM users",
+                               batch_size):
+            logger.info('', extra={'row': row})
+    finally:
+        db_connection.close()
+
+
+def csv_chunks(csv_file: TextIO,
+               chunk_lines: int = CSV_CHUNK_LINES) -> Iterator[List[str]]:
+    """
+    Split an open CSV file into chunks of whole records.
+
+    A chunk is only cut where the running count of quote characters is
+    even, so quoted fields spanning several lines stay in one chunk.
+
+    Args:
+        csv_file (TextIO): The CSV file, opened with ``newline=''``.
+        chunk_lines (int): The minimum number of lines per chunk.
+
+    Yields:
+        List[str]: The raw lines of each chunk.
+    """
+    chunk, quotes = [], 0
+    for line in csv_file:
+        chunk.append(line)
+        quotes += line.count('"')
+        if len(chunk) >= chunk_lines and quotes % 2 == 0:
+            yield chunk
+            chunk, quotes = [], 0
+    if chunk:
+        yield chunk
+
+
+def redact_csv_chunk(lines: Iterable[str], indexes: Tuple[int, ...],
+                     redaction: str) -> str:
+    """
+    Redact columns of a chunk of CSV records.
+
+    Args:
+        lines (Iterable[str]): The raw lines of whole CSV records.
+        indexes (Tuple[int, ...]): The indexes of the columns to redact.
+        redaction (str): The string to replace redacted information.
+
+    Returns:
+        str: The redacted records, serialised as CSV.
+    """
+    output = StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    for row in csv.reader(lines):
+        for index in indexes:
+            if index < len(row):
+                row[index] = redaction
+        writer.writerow(row)
+    return output.getvalue()
+
+
+class CSVMmapReader:
+    """
+    Memory-mapped CSV reader splitting a file into byte ranges of whole
+    records and handing them out as zero-copy memoryview slices.
+
+    Byte ranges are plain offsets, so worker processes can map the file
+    themselves and seek straight to their range.
+
+    Attributes:
+        csv_path (str): The path of the mapped CSV file.
+        data_offset (int): The offset of the first record after the header.
+    """
+
+    def __init__(self, csv_path: str):
+        """
+        Initialize the CSVMmapReader and map the file.
+
+        Args:
+            csv_path (str): The path of the CSV file to map.
+        """
+        self.csv_path = csv_path
+        self._file = open(csv_path, 'rb')
+        if os.fstat(self._file.fileno()).st_size == 0:
+            # an empty file cannot be mapped
+            self._mmap = b''
+        else:
+            self._mmap = mmap(self._file.fileno(), 0, access=ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        header_end = self._mmap.find(b'\n')
+        self.data_offset = len(self._mmap) if header_end < 0 \
+            else header_end + 1
 
-    logger = get_logger()
+    def __enter__(self) -> 'CSVMmapReader':
+        """ Enter the runtime context """
+        return self
+
+    def __exit__(self, *exc_info):
+        """ Exit the runtime context, unmapping the file """
+        self.close()
+
+    def close(self):
+        """
+        Release the view, unmap the file and close it.
+        """
+        self._view.release()
+        if isinstance(self._mmap, mmap):
+            self._mmap.close()
+        self._file.close()
+
+    def header(self) -> memoryview:
+        """
+        Get the header line of the file.
+
+        Returns:
+            memoryview: A zero-copy view of the header line.
+        """
+        return self._view[:self.data_offset]
+
+    def chunk(self, start: int, end: int) -> memoryview:
+        """
+        Get the records of a byte range.
+
+        Args:
+            start (int): The offset of the first byte of the range.
+            end (int): The offset just past the last byte of the range.
+
+        Returns:
+            memoryview: A zero-copy view of the range.
+        """
+        return self._view[start:end]
+
+    def ranges(self, chunk_bytes: int = CSV_CHUNK_BYTES,
+               quoted_newlines: bool = True) -> Iterator[Tuple[int, int]]:
+        """
+        Split the records of the file into byte ranges.
+
+        A range ends on the first newline past ``chunk_bytes`` at which the
+        count of quote characters since the start of the range is even, so
+        quoted fields spanning several lines are never cut. Counting the
+        quotes copies every byte of the range into this process; when the
+        file is known to have no such fields, ``quoted_newlines=False``
+        skips the count and only the pages around each boundary are read.
+
+        Args:
+            chunk_bytes (int): The minimum size of a range in bytes.
+            quoted_newlines (bool): Whether quoted fields may hold newlines.
+
+        Yields:
+            Tuple[int, int]: The start and end offsets of each range.
+        """
+        mm, size = self._mmap, len(self._mmap)
+        start = pos = self.data_offset
+        quotes = 0
+        while pos < size:
+            end = mm.find(b'\n', max(pos, start + chunk_bytes - 1))
+            end = size if end < 0 else end + 1
+            if quoted_newlines:
+                quotes += mm[pos:end].count(b'"')
+            pos = end
+            if quotes % 2 == 0 or pos == size:
+                yield start, pos
+                start, quotes = pos, 0
+
+
+def redact_csv_range(csv_path: str, start: int, end: int,
+                     indexes: Tuple[int, ...], redaction: str) -> str:
+    """
+    Redact columns of the records in a byte range of a CSV file.
+
+    The file is mapped in the calling process, so only the offsets have
+    to be sent to a worker.
+
+    Args:
+        csv_path (str): The path of the CSV file.
+        start (int): The offset of the first byte of the range.
+        end (int): The offset just past the last byte of the range.
+        indexes (Tuple[int, ...]): The indexes of the columns to redact.
+        redaction (str): The string to replace redacted information.
+
+    Returns:
+        str: The redacted records, serialised as CSV.
+    """
+    with CSVMmapReader(csv_path) as reader:
+        with reader.chunk(start, end) as chunk:
+            text = str(chunk, 'utf-8')
+    return redact_csv_chunk(StringIO(text, newline=''), indexes, redaction)
+
+
+def write_in_order(output_file: TextIO, jobs: Iterable[Tuple],
+                   workers: int):
+    """
+    Run jobs on a ProcessPoolExecutor and write their results in order.
+
+    At most two jobs per worker are in flight, so memory stays bounded
+    however many jobs there are.
+
+    Args:
+        output_file (TextIO): The file the results are written to.
+        jobs (Iterable[Tuple]): The ``(function, *args)`` of each job.
+        workers (int): The number of worker processes.
+    """
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for function, *args in jobs:
+            pending.append(executor.submit(function, *args))
+            if len(pending) >= workers * 2:
+                output_file.write(pending.popleft().result())
+        while pending:
+            output_file.write(pending.popleft().result())
+
+
+def redact_csv(csv_path: str, output_path: str,
+               fields: List[str] = PII_FIELDS, workers: int = None,
+               chunk_lines: int = CSV_CHUNK_LINES):
+    """
+    Redact the sensitive columns of a CSV file in parallel.
+
+    Chunks of records are redacted across a ProcessPoolExecutor and
+    written in their original order.
+
+    Args:
+        csv_path (str): The path of the CSV file to redact.
+        output_path (str): The path of the redacted CSV file to write.
+        fields (List[str]): A list of column names to be redacted.
+        workers (int): The number of worker processes, defaults to the
+                       number of CPUs.
+        chunk_lines (int): The minimum number of lines per chunk.
+    """
+    workers = workers or os.cpu_count() or 1
+    redaction = RedactingFormatter.REDACTION
+
+    with open(csv_path, newline='') as csv_file, \
+            open(output_path, 'w', newline='') as output_file:
+        header = csv_file.readline()
+        output_file.write(header)
+        columns = next(csv.reader([header]), [])
+        indexes = tuple(i for i, name in enumerate(columns) if name in fields)
+
+        jobs = ((redact_csv_chunk, chunk, indexes, redaction)
+                for chunk in csv_chunks(csv_file, chunk_lines))
+        write_in_order(output_file, jobs, workers)
+
+
+def redact_csv_mmap(csv_path: str, output_path: str,
+                    fields: List[str] = PII_FIELDS, workers: int = None,
+                    chunk_bytes: int = CSV_CHUNK_BYTES,
+                    quoted_newlines: bool = True):
+    """
+    Redact the sensitive columns of a CSV file in parallel, handing each
+    worker a byte range of the memory-mapped file instead of its lines.
+
+    With ``quoted_newlines=False`` the parent process only reads the
+    bytes around range boundaries; otherwise it counts the quotes of the
+    whole file to keep multi-line fields within one range.
+
+    Args:
+        csv_path (str): The path of the CSV file to redact.
+        output_path (str): The path of the redacted CSV file to write.
+        fields (List[str]): A list of column names to be redacted.
+        workers (int): The number of worker processes, defaults to the
+                       number of CPUs.
+        chunk_bytes (int): The minimum size of a chunk in bytes.
+        quoted_newlines (bool): Whether quoted fields may hold newlines.
+    """
+    workers = workers or os.cpu_count() or 1
+    redaction = RedactingFormatter.REDACTION
+
+    with CSVMmapReader(csv_path) as reader, \
+            open(output_path, 'w', newline='') as output_file:
+        with reader.header() as header_view:
+            header = str(header_view, 'utf-8')
+        output_file.write(header)
+        columns = next(csv.reader([header]), [])
+        indexes = tuple(i for i, name in enumerate(columns) if name in fields)
+
+        jobs = ((redact_csv_range, csv_path, start, end, indexes, redaction)
+                for start, end in reader.ranges(chunk_bytes,
+                                                quoted_newlines))
+        write_in_order(output_file, jobs, workers)
+
+
+def cli(argv: List[str] = None):
+    """
+    Command line entry point: redact a CSV file when one is given,
+    otherwise run main() against the database.
+
+    Args:
+        argv (List[str]): The command line arguments, defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(
+        description="Log the users table, or redact the PII columns "
+                    "of a CSV file.")
+    parser.add_argument('csv_file', nargs='?',
+                        help="CSV file to redact")
+    parser.add_argument('output_file', nargs='?',
+                        help="path of the redacted CSV file")
+    parser.add_argument('--workers', type=int,
+                        help="number of worker processes")
+    parser.add_argument('--chunk-lines', type=int, default=CSV_CHUNK_LINES,
+                        help="minimum number of lines per chunk")
+    parser.add_argument('--mmap', action='store_true',
+                        help="hand workers byte ranges of the mapped file")
+    parser.add_argument('--chunk-bytes', type=int, default=CSV_CHUNK_BYTES,
+                        help="minimum number of bytes per chunk with --mmap")
+    parser.add_argument('--no-quoted-newlines', dest='quoted_newlines',
+                        action='store_false',
+                        help="with --mmap, assume no quoted field holds a "
+                             "newline and skip counting quotes")
+    args = parser.parse_args(argv)
 
-    for row in rows:
-        msg = '; '.join([f"{field}={value}" for field, value in row.items()])
-        logger.info(filter_datum(PII_FIELDS, RedactingFormatter.REDACTION,
-                                 msg, RedactingFormatter.SEPARATOR))
+    if args.csv_file is None:
+        main()
+        return
+    if args.output_file is None:
+        parser.error("output_file is required with csv_file")
+    if args.mmap:
+        redact_csv_mmap(args.csv_file, args.output_file, PII_FIELDS,
+                        args.workers, args.chunk_bytes, args.quoted_newlines)
+        return
+    redact_csv(args.csv_file, args.output_file, PII_FIELDS,
+               args.workers, args.chunk_lines)
 
 
 if __name__ == "__main__":
-    main()
+    cli()
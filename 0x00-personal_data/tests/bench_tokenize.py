@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Tokenizing benchmark: records per second for the regex Redactor and
+the single-pass TokenRedactor as the number of fields grows
+"""
+from sys import path
+from timeit import timeit
+
+
+path.append('../')
+get_redactor = __import__('filtered_logger').get_redactor
+
+records = 20000
+
+print("{:>6} {:>14} {:>14}".format('fields', 'regex rec/s', 'token rec/s'))
+for count in (5, 10, 20, 30, 40, 50):
+    keys = ["field_{}".format(i) for i in range(count)]
+    pii = tuple(keys[::2])
+    message = '; '.join("{}=value {}".format(k, i)
+                        for i, k in enumerate(keys)) + ';'
+
+    regex = get_redactor(pii, '***', ';')
+    token = get_redactor(pii, '***', ';', True)
+    assert regex.redact(message) == token.redact(message)
+
+    regex_s = timeit(lambda: regex.redact(message), number=records)
+    token_s = timeit(lambda: token.redact(message), number=records)
+    print("{:>6} {:>14.0f} {:>14.0f}".format(
+        count, records / regex_s, records / token_s))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Connection pool check: pooled_db against a fake pool, no database needed
+"""
+import os
+import threading
+import time
+from sys import path
+
+
+path.append('../')
+filtered_logger = __import__('filtered_logger')
+PoolError = filtered_logger.PoolError
+pooled_db = filtered_logger.pooled_db
+
+
+class FakeConnection:
+    """ Pooled connection stand-in: close() returns it to its pool """
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def close(self):
+        self.pool.idle.append(self)
+
+
+class FakePool:
+    """ MySQLConnectionPool stand-in holding size idle connections """
+
+    def __init__(self, size):
+        self.idle = [FakeConnection(self) for _ in range(size)]
+
+    def get_connection(self):
+        if not self.idle:
+            raise PoolError("Failed getting connection; pool exhausted")
+        return self.idle.pop()
+
+
+os.environ['PERSONAL_DATA_DB_POOL_TIMEOUT'] = '0.2'
+pool = FakePool(2)
+
+# connections go back to the pool on exit, even on errors
+with pooled_db(pool):
+    with pooled_db(pool):
+        print("idle while both borrowed:", len(pool.idle))
+try:
+    with pooled_db(pool):
+        raise RuntimeError
+except RuntimeError:
+    pass
+print("idle after exit:", len(pool.idle))
+
+# an exhausted pool raises PoolError once the timeout is over
+with pooled_db(pool), pooled_db(pool):
+    start = time.monotonic()
+    try:
+        with pooled_db(pool):
+            pass
+        print("borrowed from an exhausted pool")
+    except PoolError:
+        waited = time.monotonic() - start
+        print("PoolError after the timeout:", 0.2 <= waited < 0.5)
+
+# a waiting borrower gets the connection returned by another thread
+with pooled_db(pool):
+    connection = pool.get_connection()
+    threading.Timer(0.05, connection.close).start()
+    with pooled_db(pool) as waited_for:
+        print("got the returned connection:", waited_for is connection)
+print("idle at the end:", len(pool.idle))
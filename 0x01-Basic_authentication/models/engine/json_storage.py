@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+""" JSONStorage module: objects kept in memory and persisted to
+    .db_<Class>.json files
+"""
+from typing import TypeVar, List, Iterable
+from bisect import bisect_right, insort
+from os import getenv, path
+import atexit
+import json
+import os
+import tempfile
+import threading
+from models.engine.storage import Storage
+
+
+class JSONStorage(Storage):
+    """ JSONStorage class
+
+    Objects live in memory, by class name then ID. Attributes a class
+    declares in `__indexes__` are indexed, so equality lookups on them in
+    `search` skip the full scan; indexes reflect the saved state of
+    objects. The sorted IDs of a class are kept once `page` needs them.
+    `refresh` reloads a class only when the modification time, size or
+    inode of its files differ from the ones it last loaded or wrote.
+
+    Persistence is configured from the environment:
+    - MODELS_STORAGE: 'file' rewrites .db_<Class>.json on every change,
+      'journal' appends one line per change to .db_<Class>.journal and
+      compacts it into .db_<Class>.json once it holds more lines than
+      MODELS_JOURNAL_COMPACT_SIZE and than there are objects, which keeps
+      writes O(1) amortized
+    - MODELS_DURABILITY: 'none' leaves syncing snapshot and journal
+      writes to the OS, 'flush' fsyncs every write, and an integer N
+      fsyncs every N writes of a class; either way a snapshot replacing
+      a journal is synced, with its directory, before the journal is
+      truncated
+    - MODELS_WRITE_BEHIND_MS: when > 0, save and remove only mark the
+      class dirty and a background thread persists dirty classes every
+      that many milliseconds, or as soon as MODELS_WRITE_BEHIND_SIZE
+      changes are pending
+    - MODELS_LAZY_LOAD: when '1', loading a class only parses its file
+      and indexes the parsed records; an object is built on the first
+      `get` or `search` that hits it
+    """
+
+    def __init__(self):
+        """ Initialize a JSONStorage instance
+        """
+        self.__data = {}
+        self.__records = {}
+        self.__indexes = {}
+        self.__indexed_values = {}
+        self.__sorted_ids = {}
+        self.__journal_sizes = {}
+        self.__write_counts = {}
+        self.__signatures = {}
+        # mode of new files: snapshots are written with mkstemp, as 0600
+        umask = os.umask(0)
+        os.umask(umask)
+        self.__file_mode = 0o666 & ~umask
+
+        self.mode = getenv('MODELS_STORAGE', 'file')
+        self.journal_compact_size = int(
+            getenv('MODELS_JOURNAL_COMPACT_SIZE', '1000'))
+        self.durability = getenv('MODELS_DURABILITY', 'none')
+        if self.durability not in ('none', 'flush') and \
+                not (self.durability.isdigit() and int(self.durability) > 0):
+            raise ValueError("MODELS_DURABILITY must be 'none', 'flush' or "
+                             "a positive integer, not {!r}".format(
+                                 self.durability))
+        self.lazy = getenv('MODELS_LAZY_LOAD', '0') == '1'
+        self.write_behind_ms = int(getenv('MODELS_WRITE_BEHIND_MS', '0'))
+        self.write_behind_size = int(
+            getenv('MODELS_WRITE_BEHIND_SIZE', '100'))
+
+        self.__dirty = {}
+        self.__pending_changes = 0
+        self.__flush_condition = threading.Condition()
+        self.__flush_lock = threading.Lock()
+        self.__flusher = None
+        self.__build_lock = threading.Lock()
+        self.__file_locks = {}
+
+    def objects(self, cls: type) -> dict:
+        """ Return the objects of a class, by ID
+        """
+        s_class = cls.__name__
+        if self.__data.get(s_class) is None:
+            self.__data[s_class] = {}
+            self.__records[s_class] = {}
+            self.__reset_indexes(cls)
+        return self.__data[s_class]
+
+    def load(self, cls: type):
+        """ Load all objects of a class from file, after persisting its
+            pending write-behind changes
+        """
+        s_class = cls.__name__
+        with self.__flush_condition:
+            dirty = s_class in self.__dirty
+        if dirty:
+            self.flush()
+        file_path = ".db_{}.json".format(s_class)
+        records = {}
+        if path.exists(file_path):
+            with open(file_path, 'r') as f:
+                records = json.load(f)
+        self.__replay_journal(cls, records)
+
+        self.__data[s_class] = {}
+        self.__records[s_class] = records
+        self.__sorted_ids.pop(s_class, None)
+        self.__reset_indexes(cls)
+        if self.lazy:
+            for obj_id, record in records.items():
+                self.__index_values(cls, obj_id, record.get)
+        else:
+            for obj_id in list(records):
+                self.__index(self.__build(cls, obj_id))
+        self.__signatures[s_class] = self.__signature(s_class)
+
+    def __signature(self, s_class: str) -> tuple:
+        """ Modification time, size and inode of the files of a class
+        """
+        signature = []
+        for file_path in (".db_{}.json", ".db_{}.journal"):
+            try:
+                st = os.stat(file_path.format(s_class))
+            except OSError:
+                signature.append(None)
+                continue
+            signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+        return tuple(signature)
+
+    def refresh(self, cls: type):
+        """ Reload the objects of a class if its files have changed
+            since they were last loaded or written, unless changes of
+            the class are still pending
+        """
+        s_class = cls.__name__
+        with self.__flush_condition:
+            if s_class in self.__dirty:
+                return
+        if self.__signatures.get(s_class) != self.__signature(s_class):
+            self.load(cls)
+
+    def __replay_journal(self, cls: type, records: dict):
+        """ Apply the changes journaled since the last snapshot
+            to the records of a class
+        """
+        s_class = cls.__name__
+        journal_path = ".db_{}.journal".format(s_class)
+        self.__journal_sizes[s_class] = 0
+        if not path.exists(journal_path):
+            return
+
+        valid_end = end = 0
+        with open(journal_path, 'rb') as f:
+            for line in f:
+                end += len(line)
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("unterminated line")
+                    entry = json.loads(line)
+                except ValueError:
+                    # torn write of the last line
+                    continue
+                valid_end = end
+                self.__journal_sizes[s_class] += 1
+                if entry['op'] == 'save':
+                    records[entry['obj']['id']] = entry['obj']
+                else:
+                    records.pop(entry['id'], None)
+
+        if valid_end < end:
+            # drop the torn bytes, or the next append would extend them
+            with open(journal_path, 'r+b') as f:
+                f.truncate(valid_end)
+                self.__sync(cls, f)
+
+    def __build(self, cls: type, obj_id: str) -> TypeVar('Base'):
+        """ Build the object of a loaded record, if it is not built yet
+        """
+        objs = self.objects(cls)
+        with self.__build_lock:
+            record = self.__records[cls.__name__].pop(obj_id, None)
+            if record is not None:
+                objs[obj_id] = cls(**record)
+        return objs.get(obj_id)
+
+    def __build_all(self, cls: type):
+        """ Build the objects of all loaded records of a class
+        """
+        for obj_id in list(self.__records[cls.__name__]):
+            self.__build(cls, obj_id)
+
+    def dump(self, cls: type):
+        """ Save all objects of a class to file
+        """
+        s_class = cls.__name__
+        with self.__file_lock(s_class):
+            file_path = ".db_{}.json".format(s_class)
+            objs = self.objects(cls)
+            objs_json = dict(self.__records[s_class])
+            for obj_id, obj in list(objs.items()):
+                objs_json[obj_id] = obj.to_json(True)
+
+            journal_path = ".db_{}.journal".format(s_class)
+            # the journal is only truncated once the snapshot holding its
+            # changes is durable: file and rename both synced
+            sync_all = self.durability != 'none' and \
+                bool(self.__journal_sizes.get(s_class))
+            try:
+                mode = os.stat(file_path).st_mode & 0o777
+            except OSError:
+                mode = self.__file_mode
+
+            fd, tmp_path = tempfile.mkstemp(prefix=file_path, suffix='.tmp',
+                                            dir='.')
+            try:
+                os.fchmod(fd, mode)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(objs_json, f)
+                    if sync_all:
+                        f.flush()
+                        os.fsync(f.fileno())
+                    else:
+                        self.__sync(cls, f)
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            if sync_all or self.durability == 'flush':
+                self.__sync_dir()
+
+            if self.__journal_sizes.get(s_class) or path.exists(journal_path):
+                open(journal_path, 'w').close()
+            self.__journal_sizes[s_class] = 0
+            self.__signatures[s_class] = self.__signature(s_class)
+
+    def __file_lock(self, s_class: str) -> threading.RLock:
+        """ Lock of the files of a class: held across a journal append
+            and the snapshot-then-truncate of a dump, so a compaction
+            never truncates away a change it did not snapshot
+        """
+        lock = self.__file_locks.get(s_class)
+        if lock is None:
+            with self.__build_lock:
+                lock = self.__file_locks.setdefault(s_class,
+                                                    threading.RLock())
+        return lock
+
+    def __persist(self, op: str, obj: TypeVar('Base')):
+        """ Persist a change: queue it in write-behind mode, append it to
+            the journal in journal mode, or rewrite the file
+        """
+        cls = obj.__class__
+        if self.write_behind_ms > 0:
+            self.__mark_dirty(cls)
+            return
+
+        if self.mode != 'journal':
+            self.dump(cls)
+            return
+
+        s_class = cls.__name__
+        if op == 'save':
+            entry = {'op': op, 'obj': obj.to_json(True)}
+        else:
+            entry = {'op': op, 'id': obj.id}
+        with self.__file_lock(s_class):
+            with open(".db_{}.journal".format(s_class), 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+                self.__sync(cls, f)
+            self.__signatures[s_class] = self.__signature(s_class)
+
+            size = self.__journal_sizes.get(s_class, 0) + 1
+            self.__journal_sizes[s_class] = size
+            if size >= max(self.journal_compact_size, self.count(cls)):
+                self.dump(cls)
+
+    def __sync(self, cls: type, f):
+        """ fsync a file being written, as often as the durability asks
+        """
+        if self.durability == 'none':
+            return
+        if self.durability != 'flush':
+            s_class = cls.__name__
+            count = self.__write_counts.get(s_class, 0) + 1
+            if count < int(self.durability):
+                self.__write_counts[s_class] = count
+                return
+            self.__write_counts[s_class] = 0
+        f.flush()
+        os.fsync(f.fileno())
+
+    def __sync_dir(self):
+        """ fsync the directory of the files, making renames durable
+        """
+        fd = os.open('.', os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def __mark_dirty(self, cls: type):
+        """ Queue a class for the background flusher
+        """
+        with self.__flush_condition:
+            self.__dirty[cls.__name__] = cls
+            self.__pending_changes += 1
+            if self.__flusher is None:
+                self.__flusher = threading.Thread(
+                    target=self.__flush_forever, daemon=True)
+                self.__flusher.start()
+                atexit.register(self.flush)
+            if self.__pending_changes >= self.write_behind_size:
+                self.__flush_condition.notify()
+
+    def __flush_forever(self):
+        """ Background flusher loop of the write-behind mode
+        """
+        while True:
+            with self.__flush_condition:
+                self.__flush_condition.wait(self.write_behind_ms / 1000)
+            self.flush()
+
+    def flush(self):
+        """ Persist every class with pending write-behind changes
+        """
+        with self.__flush_lock:
+            with self.__flush_condition:
+                dirty = list(self.__dirty.values())
+                self.__dirty.clear()
+                self.__pending_changes = 0
+            for cls in dirty:
+                self.dump(cls)
+
+    def save(self, obj: TypeVar('Base')):
+        """ Save an object
+        """
+        s_class = obj.__class__.__name__
+        objs = self.objects(obj.__class__)
+        record = self.__records[s_class].pop(obj.id, None)
+        is_new = record is None and obj.id not in objs
+        objs[obj.id] = obj
+        ids = self.__sorted_ids.get(s_class)
+        if is_new and ids is not None:
+            insort(ids, obj.id)
+        self.__index(obj)
+        self.__persist('save', obj)
+
+    def remove(self, obj: TypeVar('Base')):
+        """ Remove an object
+        """
+        cls = obj.__class__
+        objs = self.objects(cls)
+        if self.__build(cls, obj.id) is not None:
+            del objs[obj.id]
+            self.__unindex(cls, obj.id)
+            ids = self.__sorted_ids.get(cls.__name__)
+            i = bisect_right(ids or (), obj.id) - 1
+            if i >= 0 and ids[i] == obj.id:
+                del ids[i]
+            self.__persist('remove', obj)
+
+    def count(self, cls: type) -> int:
+        """ Count all objects of a class
+        """
+        objs = self.objects(cls)
+        return len(objs.keys()) + len(self.__records[cls.__name__])
+
+    def get(self, cls: type, id: str) -> TypeVar('Base'):
+        """ Return one object of a class by ID
+        """
+        return self.objects(cls).get(id) or self.__build(cls, id)
+
+    def page(self, cls: type, after: str = None,
+             limit: int = None) -> List[TypeVar('Base')]:
+        """ Return objects of a class ordered by ID, from its sorted IDs
+        """
+        s_class = cls.__name__
+        ids = self.__sorted_ids.get(s_class)
+        if ids is None:
+            objs = self.objects(cls)
+            ids = sorted(list(objs) + list(self.__records[s_class]))
+            self.__sorted_ids[s_class] = ids
+        start = 0 if after is None else bisect_right(ids, after)
+        end = len(ids) if limit is None else start + limit
+        objs = [self.get(cls, obj_id) for obj_id in ids[start:end]]
+        return [obj for obj in objs if obj is not None]
+
+    def search(self, cls: type,
+               attributes: dict) -> List[TypeVar('Base')]:
+        """ Search all objects of a class with matching attributes
+        """
+        if len(attributes) == 0:
+            self.__build_all(cls)
+            return list(self.objects(cls).values())
+        return [obj for obj in self.__candidates(cls, attributes)
+                if self.matches(obj, attributes)]
+
+    def __candidates(self, cls: type,
+                     attributes: dict) -> Iterable[TypeVar('Base')]:
+        """ Narrow a search to the objects of an index when one of
+            the attributes is indexed, or to all objects otherwise
+        """
+        objs = self.objects(cls)
+        indexes = self.__indexes[cls.__name__]
+        for k, v in attributes.items():
+            index = indexes.get(k)
+            if index is None:
+                continue
+            try:
+                obj_ids = list(index.get(v, ()))
+            except TypeError:
+                continue
+            return [objs.get(obj_id) or self.__build(cls, obj_id)
+                    for obj_id in obj_ids]
+        self.__build_all(cls)
+        return objs.values()
+
+    def __reset_indexes(self, cls: type):
+        """ Empty all indexes of a class
+        """
+        s_class = cls.__name__
+        self.__indexes[s_class] = {k: {} for k in cls.__indexes__}
+        self.__indexed_values[s_class] = {}
+
+    def __index(self, obj: TypeVar('Base')):
+        """ Add an object to the indexes, under its current values
+        """
+        cls = obj.__class__
+        if not cls.__indexes__:
+            return
+        self.__unindex(cls, obj.id)
+        self.__index_values(cls, obj.id,
+                            lambda k: getattr(obj, k, None))
+
+    def __index_values(self, cls: type, obj_id: str, value_of):
+        """ Add an object ID to the indexes, under the values returned
+            by value_of for each indexed attribute
+        """
+        s_class = cls.__name__
+        values = {}
+        for k, index in self.__indexes[s_class].items():
+            v = value_of(k)
+            try:
+                index.setdefault(v, {})[obj_id] = None
+            except TypeError:
+                continue
+            values[k] = v
+        if values:
+            self.__indexed_values[s_class][obj_id] = values
+
+    def __unindex(self, cls: type, obj_id: str):
+        """ Remove an object from the indexes, under the values
+            it was indexed with
+        """
+        s_class = cls.__name__
+        values = self.__indexed_values[s_class].pop(obj_id, None)
+        if values is None:
+            return
+        indexes = self.__indexes[s_class]
+        for k, v in values.items():
+            bucket = indexes[k].get(v)
+            if bucket is None:
+                continue
+            bucket.pop(obj_id, None)
+            if not bucket:
+                del indexes[k][v]
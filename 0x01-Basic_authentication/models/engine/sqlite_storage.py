@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+""" SQLiteStorage module: objects persisted to an SQLite database
+"""
+from typing import TypeVar, List
+from os import getenv
+import json
+import sqlite3
+import threading
+from models.engine.storage import Storage
+
+
+class SQLiteStorage(Storage):
+    """ SQLiteStorage class
+
+    Each class gets a table holding the JSON serialization of its objects
+    by ID, plus one indexed column per attribute declared in
+    `__indexes__`, so equality lookups on them are answered by the
+    database. The SQL of each class is built once and reused, so sqlite3
+    keeps every statement prepared in its statement cache.
+
+    The database path is read from MODELS_SQLITE_PATH.
+    """
+
+    COLUMN_TYPES = (str, int, float, type(None))
+
+    def __init__(self, db_path: str = None):
+        """ Initialize a SQLiteStorage instance
+        """
+        self.db_path = db_path or getenv('MODELS_SQLITE_PATH', '.db.sqlite3')
+        self.__connection = sqlite3.connect(self.db_path,
+                                            check_same_thread=False)
+        self.__lock = threading.RLock()
+        self.__statements = {}
+
+    def __sql(self, cls: type) -> dict:
+        """ Return the statements of a class, creating its table and
+            indexes on first use
+        """
+        s_class = cls.__name__
+        statements = self.__statements.get(s_class)
+        if statements is not None:
+            return statements
+
+        table = '"{}"'.format(s_class)
+        columns = ['id', 'data'] + list(cls.__indexes__)
+        quoted = ', '.join('"{}"'.format(c) for c in columns)
+        statements = {
+            'insert': 'INSERT OR REPLACE INTO {} ({}) VALUES ({})'.format(
+                table, quoted, ', '.join('?' for c in columns)),
+            'delete': 'DELETE FROM {} WHERE id = ?'.format(table),
+            'count': 'SELECT COUNT(*) FROM {}'.format(table),
+            'get': 'SELECT data FROM {} WHERE id = ?'.format(table),
+            'all': 'SELECT data FROM {} ORDER BY rowid'.format(table),
+            'page': 'SELECT data FROM {} WHERE id > ? ORDER BY id '
+                    'LIMIT ?'.format(table),
+        }
+        for k in cls.__indexes__:
+            statements['by_' + k] = \
+                'SELECT data FROM {} WHERE "{}" IS ? ORDER BY rowid'.format(
+                    table, k)
+
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                'CREATE TABLE IF NOT EXISTS {} ('
+                'id TEXT PRIMARY KEY, data TEXT NOT NULL{})'.format(
+                    table, ''.join(', "{}"'.format(k)
+                                   for k in cls.__indexes__)))
+            for k in cls.__indexes__:
+                self.__connection.execute(
+                    'CREATE INDEX IF NOT EXISTS "ix_{}_{}" ON {} ("{}")'
+                    .format(s_class, k, table, k))
+        self.__statements[s_class] = statements
+        return statements
+
+    def __query(self, cls: type, name: str,
+                params: tuple = ()) -> List[TypeVar('Base')]:
+        """ Run a SELECT statement of a class and build its objects
+        """
+        sql = self.__sql(cls)[name]
+        with self.__lock:
+            rows = self.__connection.execute(sql, params).fetchall()
+        return [cls(**json.loads(data)) for data, in rows]
+
+    def load(self, cls: type):
+        """ Make sure the table of a class exists
+        """
+        self.__sql(cls)
+
+    def save(self, obj: TypeVar('Base')):
+        """ Save an object
+        """
+        cls = obj.__class__
+        values = [obj.id, json.dumps(obj.to_json(True))]
+        for k in cls.__indexes__:
+            v = getattr(obj, k, None)
+            values.append(v if type(v) in self.COLUMN_TYPES else None)
+        sql = self.__sql(cls)['insert']
+        with self.__lock, self.__connection:
+            self.__connection.execute(sql, values)
+
+    def remove(self, obj: TypeVar('Base')):
+        """ Remove an object
+        """
+        sql = self.__sql(obj.__class__)['delete']
+        with self.__lock, self.__connection:
+            self.__connection.execute(sql, (obj.id,))
+
+    def count(self, cls: type) -> int:
+        """ Count all objects of a class
+        """
+        sql = self.__sql(cls)['count']
+        with self.__lock:
+            return self.__connection.execute(sql).fetchone()[0]
+
+    def get(self, cls: type, id: str) -> TypeVar('Base'):
+        """ Return one object of a class by ID
+        """
+        objs = self.__query(cls, 'get', (id,))
+        return objs[0] if objs else None
+
+    def page(self, cls: type, after: str = None,
+             limit: int = None) -> List[TypeVar('Base')]:
+        """ Return objects of a class ordered by ID, walking the primary
+            key index from the ID after
+        """
+        return self.__query(cls, 'page', (after or '',
+                                          -1 if limit is None else limit))
+
+    def search(self, cls: type,
+               attributes: dict) -> List[TypeVar('Base')]:
+        """ Search all objects of a class with matching attributes
+        """
+        for k, v in attributes.items():
+            if k in cls.__indexes__ and type(v) in self.COLUMN_TYPES:
+                objs = self.__query(cls, 'by_' + k, (v,))
+                break
+        else:
+            objs = self.__query(cls, 'all')
+        return [obj for obj in objs if self.matches(obj, attributes)]
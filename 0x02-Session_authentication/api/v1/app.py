@@ -4,6 +4,7 @@ Route module for the API
 """
 from os import getenv
 from api.v1.views import app_views
+from api.v1.auth.auth import ExcludedPaths
 from flask import Flask, jsonify, abort, request
 from flask_cors import (CORS, cross_origin)
 
@@ -14,6 +15,16 @@ CORS(app, resources={r"/api/v1/*": {"origins": "*"}})
 
 auth = None
 
+# paths where authentication is not required, extended with the
+# comma separated paths of AUTH_EXCLUDED_PATHS; '*' ends a prefix
+excluded_paths = ExcludedPaths([
+    '/api/v1/status/',
+    '/api/v1/unauthorized/',
+    '/api/v1/forbidden/',
+    '/api/v1/auth_session/login/'
+] + [p.strip() for p in getenv('AUTH_EXCLUDED_PATHS', '').split(',')
+     if p.strip()])
+
 auth_type = getenv('AUTH_TYPE')
 if auth_type == 'auth':
     from api.v1.auth.auth import Auth
@@ -39,12 +50,6 @@ def before_request():
     if not auth:
         return
 
-    excluded_paths = [
-        '/api/v1/status/',
-        '/api/v1/unauthorized/',
-        '/api/v1/forbidden/',
-        '/api/v1/auth_session/login/'
-    ]
     if not auth.require_auth(request.path, excluded_paths):
         return
 
@@ -54,9 +59,9 @@ def before_request():
     ):
         abort(401)
 
-    if not auth.current_user(request):
-        abort(403)
     request.current_user = auth.current_user(request)
+    if not request.current_user:
+        abort(403)
 
 
 @app.errorhandler(404)
@@ -1,20 +1,65 @@
 #!/usr/bin/env python3
 """ Auth module for handling authentication logic
 """
-from typing import List, TypeVar
+from typing import Iterable, List, TypeVar
 from os import getenv
 from uuid import uuid4
+import re
+
+
+class ExcludedPaths:
+    """ Excluded paths compiled for matching: exact paths, slash
+        normalised, in a set and paths ending with '*' as prefixes of
+        one regex
+    """
+    def __init__(self, excluded_paths: Iterable[str]):
+        """ Compile excluded paths
+
+        Args:
+            excluded_paths: Paths where authentication is not required,
+                            the ones ending with '*' matching any path
+                            they are a prefix of.
+        """
+        self.paths = tuple(excluded_paths)
+        self.exact = frozenset(p.rstrip('/') for p in self.paths
+                               if not p.endswith('*'))
+        prefixes = sorted(set(p[:-1] for p in self.paths if p.endswith('*')))
+        self.prefixes = None
+        if prefixes:
+            self.prefixes = re.compile(
+                '|'.join(re.escape(prefix) for prefix in prefixes))
+
+    def __bool__(self) -> bool:
+        """ True if there is any excluded path
+        """
+        return bool(self.paths)
+
+    def matches(self, path: str) -> bool:
+        """ Check if a path is excluded
+
+        Args:
+            path: The path to check.
+
+        Returns:
+            bool: True if the path is excluded, False otherwise.
+        """
+        if path.rstrip('/') in self.exact:
+            return True
+        return self.prefixes is not None and \
+            self.prefixes.match(path) is not None
 
 
 class Auth:
     """ Auth class for handling authentication logic
     """
-    def require_auth(self, path: str, excluded_paths: List[str]) -> bool:
+    def require_auth(self, path: str,
+                     excluded_paths: List[str]) -> bool:
         """Check if authentication is required for the given path.
 
         Args:
             path: The path to check for authentication requirement.
-            excluded_paths: List of paths where authentication is not required.
+            excluded_paths: List of paths where authentication is not required,
+                            or the ExcludedPaths compiled from it.
 
         Returns:
             bool: True if authentication is required, False otherwise.
@@ -22,14 +67,10 @@ class Auth:
         if not path or not excluded_paths:
             return True
 
-        for excluded_path in excluded_paths:
-            if excluded_path.endswith('*'):
-                if path.startswith(excluded_path[:-1]):
-                    return False
-            elif excluded_path in (path, path + '/'):
-                return False
+        if not isinstance(excluded_paths, ExcludedPaths):
+            excluded_paths = ExcludedPaths(excluded_paths)
 
-        return True
+        return not excluded_paths.matches(path)
 
     def authorization_header(self, request=None) -> str:
         """Extract the Authorization header from the provided Flask request.
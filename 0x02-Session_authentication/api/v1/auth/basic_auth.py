@@ -2,6 +2,12 @@
 """ BasicAuth module for handling basic authentication logic
 """
 import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
 from typing import TypeVar
 from models.user import User
 from api.v1.auth.auth import Auth
@@ -10,8 +16,23 @@ from api.v1.auth.auth import Auth
 class BasicAuth(Auth):
     """ BasicAuth class inherits from Auth for handling
         basic authentication logic
+
+    Authenticated credentials are cached for BASIC_AUTH_CACHE_TTL seconds
+    (0 disables the cache), at most BASIC_AUTH_CACHE_SIZE of them. The
+    cache maps a keyed digest of the Authorization header, never the
+    header itself, to the user ID; an entry only stands while the user
+    exists with the same email and password.
     """
 
+    def __init__(self):
+        """ Initialize a BasicAuth instance
+        """
+        self.cache_ttl = float(os.getenv('BASIC_AUTH_CACHE_TTL', '60'))
+        self.cache_size = int(os.getenv('BASIC_AUTH_CACHE_SIZE', '1024'))
+        self.__cache_key = os.urandom(32)
+        self.__cache = OrderedDict()
+        self.__cache_lock = threading.Lock()
+
     def extract_base64_authorization_header(
             self, authorization_header: str) -> str:
         """ Extract the base64-encoded credentials from
@@ -121,6 +142,10 @@ class BasicAuth(Auth):
         """
         header = self.authorization_header(request)
 
+        user = self.cached_user(header)
+        if user is not None:
+            return user
+
         token = self.extract_base64_authorization_header(header)
 
         decoded = self.decode_base64_authorization_header(token)
@@ -129,4 +154,65 @@ class BasicAuth(Auth):
 
         user = self.user_object_from_credentials(user_email, user_password)
 
+        if user is not None:
+            self.cache_user(header, user)
+
         return user
+
+    def __digest(self, authorization_header: str) -> bytes:
+        """ Keyed digest of an Authorization header, the cache key
+        """
+        return hmac.new(self.__cache_key, authorization_header.encode(),
+                        hashlib.sha256).digest()
+
+    def cached_user(self, authorization_header: str) -> TypeVar('User'):
+        """ Get the User authenticated by an Authorization header
+            from the cache.
+
+        Args:
+            authorization_header: The Authorization header value.
+
+        Returns:
+            The User instance if the header is cached and the user still
+            has the cached email and password, otherwise None.
+        """
+        if self.cache_ttl <= 0 or not isinstance(authorization_header, str):
+            return None
+
+        digest = self.__digest(authorization_header)
+        with self.__cache_lock:
+            entry = self.__cache.get(digest)
+            if entry is None:
+                return None
+            user_id, email, password, expires = entry
+            if expires <= time.monotonic():
+                del self.__cache[digest]
+                return None
+            self.__cache.move_to_end(digest)
+
+        user = User.get(user_id)
+        if user is None or user.email != email or user.password != password:
+            with self.__cache_lock:
+                self.__cache.pop(digest, None)
+            return None
+        return user
+
+    def cache_user(self, authorization_header: str, user: TypeVar('User')):
+        """ Cache the User authenticated by an Authorization header,
+            evicting the least recently used entry when the cache is full.
+
+        Args:
+            authorization_header: The Authorization header value.
+            user: The authenticated User instance.
+        """
+        if self.cache_ttl <= 0 or self.cache_size <= 0:
+            return
+
+        digest = self.__digest(authorization_header)
+        entry = (user.id, user.email, user.password,
+                 time.monotonic() + self.cache_ttl)
+        with self.__cache_lock:
+            self.__cache[digest] = entry
+            self.__cache.move_to_end(digest)
+            while len(self.__cache) > self.cache_size:
+                self.__cache.popitem(last=False)
@@ -4,13 +4,27 @@
 from uuid import uuid4
 from models.user import User
 from api.v1.auth.auth import Auth
+from api.v1.auth.session_store import SessionStore, ShardedSessionStore
 
 
 class SessionAuth(Auth):
     """ SessionAuth class inherits from Auth for handling
         session authentication logic
+
+    Sessions are kept in a SessionStore, shared by all instances
+    unless one is given a store of its own.
     """
-    user_id_by_session_id: dict = {}
+    user_id_by_session_id: SessionStore = ShardedSessionStore()
+
+    def __init__(self, session_store: SessionStore = None):
+        """ Initialize SessionAuth instance
+
+        Args:
+            session_store: The store of the sessions. Defaults to the
+                           store shared by all instances.
+        """
+        if session_store is not None:
+            self.user_id_by_session_id = session_store
 
     def create_session(self, user_id: str = None) -> str:
         """ Create a Session ID for the given user_id.
@@ -61,6 +75,16 @@ class SessionAuth(Auth):
 
         return user
 
+    def metrics(self) -> dict:
+        """ Get the metrics of the sessions
+
+        Return:
+            The number of live sessions and the counters of the store
+        """
+        metrics = self.user_id_by_session_id.stats()
+        metrics['live'] = metrics.pop('entries')
+        return metrics
+
     def destroy_session(self, request=None):
         """ deletes the user session and logout
 
@@ -78,6 +102,6 @@ class SessionAuth(Auth):
         if not self.user_id_for_session_id(session_id):
             return False
 
-        del self.user_id_by_session_id[session_id]
+        self.user_id_by_session_id.pop(session_id, None)
 
         return True
@@ -10,6 +10,11 @@ from models.user_session import UserSession
 class SessionDBAuth(SessionExpAuth):
     """ SessionExpAuth class inherits from SessionAuth for handling
         session authentication logic with expiration
+
+    Sessions are kept as UserSession objects, looked up by the
+    session_id index of the model. The file is only reloaded when
+    another process has changed it, so a lookup costs O(1) rather than
+    a parse of every stored session.
     """
 
     def create_session(self, user_id: str = None) -> Union[str, None]:
@@ -26,9 +31,8 @@ class SessionDBAuth(SessionExpAuth):
         if not session_id:
             return None
 
-        kwargs = self.user_id_by_session_id.get(session_id)
-        kwargs['session_id'] = session_id
-        user_session = UserSession(kwargs)
+        UserSession.refresh()
+        user_session = UserSession(user_id=user_id, session_id=session_id)
         user_session.save()
 
         return session_id
@@ -47,15 +51,13 @@ class SessionDBAuth(SessionExpAuth):
         if not isinstance(session_id, str):
             return None
 
-        UserSession.load_from_file()
-        session_dict = UserSession.search({'session_id': session_id})
-        if not session_dict:
+        UserSession.refresh()
+        user_sessions = UserSession.search({'session_id': session_id})
+        if not user_sessions:
             return None
 
-        for _dict in session_dict:
-            if _dict.session_id == session_id:
-                created_at = _dict.get('created_at')
-                user_id = _dict.get('user_id')
+        created_at = user_sessions[0].created_at
+        user_id = user_sessions[0].user_id
 
         if self.session_duration <= 0:
             return user_id
@@ -63,8 +65,9 @@ class SessionDBAuth(SessionExpAuth):
         if not created_at:
             return None
 
+        # UserSession timestamps are UTC
         exp_time = created_at + timedelta(seconds=self.session_duration)
-        if exp_time < datetime.now():
+        if exp_time < datetime.utcnow():
             return None
 
         return user_id
@@ -82,14 +85,16 @@ class SessionDBAuth(SessionExpAuth):
             return False
 
         session_id = self.session_cookie(request)
+        if not isinstance(session_id, str):
+            return False
 
-        session_dict = UserSession.search({'session_id': session_id})
-        if not session_dict:
+        UserSession.refresh()
+        user_sessions = UserSession.search({'session_id': session_id})
+        if not user_sessions:
             return False
 
-        for _dict in session_dict:
-            if _dict.session_id == session_id:
-                _dict.remove()
-                return True
+        self.user_id_by_session_id.pop(session_id, None)
+        for user_session in user_sessions:
+            user_session.remove()
 
-        return False
+        return True
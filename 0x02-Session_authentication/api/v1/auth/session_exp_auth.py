@@ -4,22 +4,45 @@
 from os import getenv
 from typing import Union
 from datetime import datetime, timedelta
+import heapq
+import threading
 from api.v1.auth.session_auth import SessionAuth
+from api.v1.auth.session_store import SessionStore
 
 
 class SessionExpAuth(SessionAuth):
     """ SessionExpAuth class inherits from SessionAuth for handling
         session authentication logic with expiration
+
+    When SESSION_DURATION is set, every session is scheduled on a
+    min-heap by expiration time, and a background sweeper thread pops
+    and evicts sessions as they expire, so the work done is proportional
+    to the expired sessions and never scans the live ones. Sessions
+    logged out or evicted by the store leave dead entries in the heap;
+    it is compacted once it holds twice as many entries as the store,
+    so it stays bounded by the size of the store.
     """
-    def __init__(self):
+    COMPACT_SLACK = 64
+
+    def __init__(self, session_store: SessionStore = None):
         """ Initialize SessionExpAuth instance
+
+        Args:
+            session_store: The store of the sessions. Defaults to the
+                           store shared by all instances.
         """
+        super().__init__(session_store)
         duration = getenv('SESSION_DURATION', '0')
         try:
             self.session_duration = int(duration)
         except ValueError:
             self.session_duration = 0
 
+        self.__expirations = []
+        self.__expired = 0
+        self.__sweep_condition = threading.Condition()
+        self.__sweeper = None
+
     def create_session(self, user_id: str = None) -> Union[str, None]:
         """ Create a Session ID for the given user_id.
 
@@ -39,9 +62,116 @@ class SessionExpAuth(SessionAuth):
                 'created_at': datetime.now()
                 }
         self.user_id_by_session_id[session_id] = session_dict
+        self.schedule_expiration(session_id, session_dict)
 
         return session_id
 
+    def schedule_expiration(self, session_id: str, session_dict: dict):
+        """ Schedule the eviction of a session when it expires.
+
+        Args:
+            session_id: The Session ID.
+            session_dict: The session, evicted only if still stored
+                          under the Session ID when it expires.
+        """
+        if self.session_duration <= 0:
+            return
+
+        expires_at = session_dict['created_at'] + \
+            timedelta(seconds=self.session_duration)
+        with self.__sweep_condition:
+            heapq.heappush(self.__expirations,
+                           (expires_at, session_id, session_dict))
+            self.__compact_if_needed()
+            if self.__sweeper is None:
+                self.__sweeper = threading.Thread(target=self.__sweep_forever,
+                                                  daemon=True)
+                self.__sweeper.start()
+            elif self.__expirations[0][1] == session_id:
+                # expires before the one the sweeper waits for
+                self.__sweep_condition.notify()
+
+    def __compact_if_needed(self):
+        """ Compact the expirations once dead entries make up most of
+            them; the sweep condition must be held
+        """
+        if len(self.__expirations) > \
+                2 * len(self.user_id_by_session_id) + self.COMPACT_SLACK:
+            self.__compact()
+
+    def __compact(self):
+        """ Drop the expirations of sessions no longer stored; the sweep
+            condition must be held
+        """
+        store = self.user_id_by_session_id
+        self.__expirations = [entry for entry in self.__expirations
+                              if store.peek(entry[1]) is entry[2]]
+        heapq.heapify(self.__expirations)
+
+    def destroy_session(self, request=None):
+        """ deletes the user session and logout
+
+        Args:
+            request: The Flask request object. Defaults to None.
+
+        Return:
+            True if successful, False otherwise
+        """
+        destroyed = super().destroy_session(request)
+        if destroyed:
+            with self.__sweep_condition:
+                self.__compact_if_needed()
+        return destroyed
+
+    def __sweep_forever(self):
+        """ Background sweeper loop: wait for the next expiration, then
+            evict the expired sessions
+        """
+        while True:
+            with self.__sweep_condition:
+                timeout = None
+                if self.__expirations:
+                    timeout = (self.__expirations[0][0] -
+                               datetime.now()).total_seconds()
+                if timeout is None or timeout > 0:
+                    self.__sweep_condition.wait(timeout)
+            self.sweep()
+
+    def sweep(self) -> int:
+        """ Evict the expired sessions
+
+        Returns:
+            The number of evicted sessions
+        """
+        now = datetime.now()
+        expired = []
+        with self.__sweep_condition:
+            while self.__expirations and self.__expirations[0][0] <= now:
+                expired.append(heapq.heappop(self.__expirations))
+
+        evicted = 0
+        for expires_at, session_id, session_dict in expired:
+            if self.user_id_by_session_id.discard(session_id, session_dict):
+                evicted += 1
+        with self.__sweep_condition:
+            self.__expired += evicted
+        return evicted
+
+    def metrics(self) -> dict:
+        """ Get the metrics of the sessions
+
+        Return:
+            The number of live sessions, of sessions evicted as expired
+            and of scheduled expirations, and the counters of the store.
+            Scheduled expirations include those of sessions already
+            gone, until the next compaction drops them.
+        """
+        metrics = super().metrics()
+        with self.__sweep_condition:
+            metrics['expired'] = self.__expired
+            metrics['scheduled'] = len(self.__expirations)
+        return metrics
+
     def user_id_for_session_id(self, session_id: str = None) -> str:
         """ Get the User ID associated with the given Session ID.
 
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+""" SessionStore module for keeping sessions in memory
+"""
+from collections import OrderedDict
+from os import getenv
+from typing import Any
+import threading
+
+
+class SessionStore:
+    """ SessionStore class: interface of the session stores
+
+    A store maps Session IDs to session values and reads like a dict,
+    so session auth classes can use any store as their
+    `user_id_by_session_id`.
+    """
+
+    def get(self, session_id: str, default: Any = None) -> Any:
+        """ Get the value of a session
+
+        Args:
+            session_id: The Session ID.
+            default: The value returned if the session is not stored.
+
+        Returns:
+            The value of the session, default if not stored.
+        """
+        raise NotImplementedError
+
+    def set(self, session_id: str, value: Any):
+        """ Store the value of a session
+
+        Args:
+            session_id: The Session ID.
+            value: The value of the session.
+        """
+        raise NotImplementedError
+
+    def pop(self, session_id: str, default: Any = None) -> Any:
+        """ Remove a session
+
+        Args:
+            session_id: The Session ID.
+            default: The value returned if the session is not stored.
+
+        Returns:
+            The value of the removed session, default if not stored.
+        """
+        raise NotImplementedError
+
+    def peek(self, session_id: str, default: Any = None) -> Any:
+        """ Get the value of a session without marking it as used
+
+        Args:
+            session_id: The Session ID.
+            default: The value returned if the session is not stored.
+
+        Returns:
+            The value of the session, default if not stored.
+        """
+        return self.get(session_id, default)
+
+    def discard(self, session_id: str, value: Any) -> bool:
+        """ Remove a session if it still has the given value
+
+        Args:
+            session_id: The Session ID.
+            value: The value the session must have to be removed.
+
+        Returns:
+            True if the session has been removed, False otherwise.
+        """
+        missing = object()
+        if self.get(session_id, missing) is not value:
+            return False
+        return self.pop(session_id, missing) is not missing
+
+    def __len__(self) -> int:
+        """ Number of stored sessions
+        """
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """ Counters of the store
+        """
+        return {'entries': len(self)}
+
+    def __getitem__(self, session_id: str) -> Any:
+        """ Get the value of a session, KeyError if not stored
+        """
+        missing = object()
+        value = self.get(session_id, missing)
+        if value is missing:
+            raise KeyError(session_id)
+        return value
+
+    def __setitem__(self, session_id: str, value: Any):
+        """ Store the value of a session
+        """
+        self.set(session_id, value)
+
+    def __delitem__(self, session_id: str):
+        """ Remove a session, KeyError if not stored
+        """
+        missing = object()
+        if self.pop(session_id, missing) is missing:
+            raise KeyError(session_id)
+
+    def __contains__(self, session_id: str) -> bool:
+        """ Check if a session is stored
+        """
+        missing = object()
+        return self.get(session_id, missing) is not missing
+
+
+class ShardedSessionStore(SessionStore):
+    """ ShardedSessionStore class: sessions split over shards by hash
+        of their ID, each shard with its own lock, so threads working on
+        different shards never wait for each other
+
+    Each shard holds at most its share of `max_entries` and evicts its
+    least recently used sessions beyond that. Sizes are read from
+    SESSION_STORE_SIZE (default 100000) and SESSION_STORE_SHARDS
+    (default 16).
+    """
+
+    def __init__(self, max_entries: int = None, shards: int = None):
+        """ Initialize a ShardedSessionStore instance
+
+        Args:
+            max_entries: The maximum number of sessions stored.
+            shards: The number of shards.
+        """
+        if max_entries is None:
+            max_entries = int(getenv('SESSION_STORE_SIZE', '100000'))
+        if shards is None:
+            shards = int(getenv('SESSION_STORE_SHARDS', '16'))
+        self.shards = max(1, shards)
+        self.max_entries = max_entries
+        # ceiling division, so the shards hold max_entries together
+        self.shard_size = max(1, -(-max_entries // self.shards))
+        self.__entries = [OrderedDict() for i in range(self.shards)]
+        self.__locks = [threading.Lock() for i in range(self.shards)]
+        self.__counters = [{'hits': 0, 'misses': 0, 'evictions': 0}
+                           for i in range(self.shards)]
+
+    def __shard(self, session_id: str) -> int:
+        """ Index of the shard of a session
+        """
+        return hash(session_id) % self.shards
+
+    def get(self, session_id: str, default: Any = None) -> Any:
+        """ Get the value of a session, marking it as recently used
+        """
+        i = self.__shard(session_id)
+        entries = self.__entries[i]
+        with self.__locks[i]:
+            if session_id not in entries:
+                self.__counters[i]['misses'] += 1
+                return default
+            self.__counters[i]['hits'] += 1
+            entries.move_to_end(session_id)
+            return entries[session_id]
+
+    def set(self, session_id: str, value: Any):
+        """ Store the value of a session, evicting the least recently
+            used sessions of its shard when full
+        """
+        i = self.__shard(session_id)
+        entries = self.__entries[i]
+        with self.__locks[i]:
+            entries[session_id] = value
+            entries.move_to_end(session_id)
+            while len(entries) > self.shard_size:
+                entries.popitem(last=False)
+                self.__counters[i]['evictions'] += 1
+
+    def pop(self, session_id: str, default: Any = None) -> Any:
+        """ Remove a session
+        """
+        i = self.__shard(session_id)
+        with self.__locks[i]:
+            return self.__entries[i].pop(session_id, default)
+
+    def peek(self, session_id: str, default: Any = None) -> Any:
+        """ Get the value of a session, without counting a hit or a miss
+            or marking it as recently used
+        """
+        i = self.__shard(session_id)
+        with self.__locks[i]:
+            return self.__entries[i].get(session_id, default)
+
+    def discard(self, session_id: str, value: Any) -> bool:
+        """ Remove a session if it still has the given value, without
+            counting a hit or a miss
+        """
+        i = self.__shard(session_id)
+        entries = self.__entries[i]
+        with self.__locks[i]:
+            if entries.get(session_id) is not value:
+                return False
+            del entries[session_id]
+            return True
+
+    def __len__(self) -> int:
+        """ Number of stored sessions
+        """
+        return sum(len(entries) for entries in self.__entries)
+
+    def __repr__(self) -> str:
+        """ Stored sessions, as a dict
+        """
+        sessions = {}
+        for i in range(self.shards):
+            with self.__locks[i]:
+                sessions.update(self.__entries[i])
+        return repr(sessions)
+
+    def stats(self) -> dict:
+        """ Number of stored sessions, and hits, misses and evictions
+            since the store was created
+        """
+        stats = {'entries': len(self), 'hits': 0, 'misses': 0,
+                 'evictions': 0}
+        for i in range(self.shards):
+            with self.__locks[i]:
+                for k, v in self.__counters[i].items():
+                    stats[k] += v
+        return stats
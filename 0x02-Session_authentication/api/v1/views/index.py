@@ -19,10 +19,14 @@ def stats() -> str:
     """ GET /api/v1/stats
     Return:
       - the number of each objects
+      - the metrics of the sessions, under session authentication
     """
     from models.user import User
+    from api.v1.app import auth
     stats = {}
     stats['users'] = User.count()
+    if hasattr(auth, 'metrics'):
+        stats['sessions'] = auth.metrics()
     return jsonify(stats)
 
 
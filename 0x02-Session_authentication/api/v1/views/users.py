@@ -1,19 +1,160 @@
 #!/usr/bin/env python3
 """ Module of Users views
 """
-from flask import abort, jsonify, request
+from base64 import b64decode, urlsafe_b64encode
+from hashlib import sha1
+from typing import Iterable, Iterator, Tuple
+from flask import (Response, abort, json, jsonify, request,
+                   stream_with_context)
 from api.v1.views import app_views
 from models.user import User
 
 
+USERS_PAGE_MAX = 1000
+USERS_STREAM_BATCH = 100
+
+
+def encode_cursor(user_id: str) -> str:
+    """ Opaque cursor token for the page after a User ID
+    """
+    return urlsafe_b64encode(user_id.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> str:
+    """ User ID of a cursor token, None if the token is invalid
+    """
+    try:
+        user_id = b64decode(cursor.encode('ascii'), altchars=b'-_',
+                            validate=True).decode('utf-8')
+    except (ValueError, UnicodeError):
+        return None
+    return user_id or None
+
+
+def parse_fields() -> Tuple[str]:
+    """ Public User fields asked for with ?fields=a,b, None if all of
+        them are, and an empty tuple if any of them is unknown
+    """
+    fields = request.args.get('fields')
+    if fields is None:
+        return None
+    fields = tuple(k.strip() for k in fields.split(',') if k.strip())
+    for k in fields:
+        if k not in User.__public_fields__:
+            return ()
+    return fields
+
+
+def etag(users: Iterable[User], fields: Tuple[str] = None) -> str:
+    """ Strong ETag of the JSON representation of users: a digest of
+        their IDs and updated_at, and of the projected fields
+        (updated_at is stored to the second, so the field values are
+        digested too and catch updates within the same second)
+    """
+    fields = fields or User.__public_fields__
+    digest = sha1(','.join(fields).encode('utf-8'))
+    for user in users:
+        digest.update(repr((user.id, user.updated_at.isoformat()) +
+                           tuple(getattr(user, k, None) for k in fields))
+                      .encode('utf-8'))
+    return digest.hexdigest()
+
+
+def not_modified(tag: str) -> Response:
+    """ 304 response if the client already has the representation
+        tagged tag, None otherwise
+    """
+    if not request.if_none_match.contains(tag):
+        return None
+    response = Response(status=304)
+    response.set_etag(tag)
+    return response
+
+
+def with_etag(response: Response, tag: str) -> Response:
+    """ Tag a response
+    """
+    response.set_etag(tag)
+    return response
+
+
+def stream_users(after: str = None, limit: int = None,
+                 fields: Tuple[str] = None) -> Iterator[str]:
+    """ Yield the JSON array of users ordered by ID, element by element,
+        reading them USERS_STREAM_BATCH at a time
+    """
+    separator = '['
+    while limit is None or limit > 0:
+        batch = USERS_STREAM_BATCH if limit is None \
+            else min(limit, USERS_STREAM_BATCH)
+        users = User.page(after, batch)
+        for user in users:
+            yield separator + json.dumps(
+                user.to_json(fields=fields))
+            separator = ','
+        if len(users) < batch:
+            break
+        after = users[-1].id
+        if limit is not None:
+            limit -= batch
+    yield ']\n' if separator == ',' else '[]\n'
+
+
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
 def view_all_users() -> str:
     """ GET /api/v1/users
+    Query parameters:
+      - limit (optional): page size, up to USERS_PAGE_MAX
+      - cursor (optional): X-Next-Cursor of the previous page
+      - stream (optional): 1 to stream the JSON array
+      - fields (optional): comma separated fields to return
     Return:
-      - list of all User objects JSON represented
+      - list of all User objects JSON represented, ordered by ID when
+        paginated or streamed
+      - X-Next-Cursor header when there may be a next page
+      - 304 if If-None-Match has the ETag of the list (not streamed)
+      - 400 if limit, cursor or fields is invalid
     """
-    all_users = [user.to_json() for user in User.all()]
-    return jsonify(all_users)
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    stream = request.args.get('stream') in ('1', 'true')
+    fields = parse_fields()
+    if fields == ():
+        return jsonify({'error': "Invalid fields"}), 400
+    if limit is None and cursor is None and not stream:
+        all_users = list(User.all())
+        tag = etag(all_users, fields)
+        return not_modified(tag) or with_etag(
+            jsonify([user.to_json(fields=fields) for user in all_users]),
+            tag)
+
+    after = None
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        if after is None:
+            return jsonify({'error': "Invalid cursor"}), 400
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= USERS_PAGE_MAX:
+            return jsonify({'error': "Invalid limit"}), 400
+    elif not stream:
+        limit = USERS_PAGE_MAX
+
+    if stream:
+        return Response(
+            stream_with_context(stream_users(after, limit, fields)),
+            mimetype='application/json')
+
+    users = User.page(after, limit)
+    tag = etag(users, fields)
+    response = not_modified(tag) or with_etag(
+        jsonify([user.to_json(fields=fields) for user in users]), tag)
+    if len(users) == limit:
+        response.headers['X-Next-Cursor'] = encode_cursor(users[-1].id)
+    return response
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -21,12 +162,19 @@ def view_one_user(user_id: str = None) -> str:
     """ GET /api/v1/users/:id
     Path parameter:
       - User ID
+    Query parameter:
+      - fields (optional): comma separated fields to return
     Return:
       - User object JSON represented
+      - 304 if If-None-Match has the ETag of the User
       - 404 if the User ID doesn't exist
+      - 400 if fields is invalid
     """
     if user_id is None:
         abort(404)
+    fields = parse_fields()
+    if fields == ():
+        return jsonify({'error': "Invalid fields"}), 400
     if user_id == 'me':
         if request.current_user is None:
             abort(404)
@@ -35,7 +183,9 @@ def view_one_user(user_id: str = None) -> str:
         user = User.get(user_id)
     if user is None:
         abort(404)
-    return jsonify(user.to_json())
+    tag = etag((user,), fields)
+    return not_modified(tag) or with_etag(
+        jsonify(user.to_json(fields=fields)), tag)
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'], strict_slashes=False)
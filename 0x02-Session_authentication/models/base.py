@@ -3,37 +3,128 @@
 """
 from datetime import datetime
 from typing import TypeVar, List, Iterable
-from os import path
-import json
+from os import getenv
 import uuid
 
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
-DATA = {}
+
+
+def is_canonical_timestamp(value: str) -> bool:
+    """ Check if a string has exactly the YYYY-MM-DDTHH:MM:SS shape
+        TIMESTAMP_FORMAT produces
+    """
+    return len(value) == 19 and value[4] == value[7] == '-' and \
+        value[10] == 'T' and value[13] == value[16] == ':'
+
+
+def parse_timestamp(value: str) -> datetime:
+    """ Parse a TIMESTAMP_FORMAT string, much faster than strptime
+        for strings of exactly that shape; any other string goes
+        through strptime, which rejects it or normalizes it as before
+    """
+    if is_canonical_timestamp(value):
+        return datetime.fromisoformat(value)
+    return datetime.strptime(value, TIMESTAMP_FORMAT)
+
+
+def format_timestamp(value: datetime) -> str:
+    """ Format a datetime as a TIMESTAMP_FORMAT string, much faster
+        than strftime
+    """
+    return value.isoformat(timespec='seconds')
+
+
+class Timestamp():
+    """ Timestamp descriptor: a datetime attribute stored in a slot
+        along with its TIMESTAMP_FORMAT string, which is formatted on
+        demand and dropped whenever the attribute is assigned
+    """
+
+    def __set_name__(self, owner: type, name: str):
+        """ Name the slots backing the attribute
+        """
+        self.value_slot = '_' + name
+        self.text_slot = '_' + name + '_text'
+
+    def __get__(self, obj, objtype: type = None) -> datetime:
+        """ Return the datetime
+        """
+        if obj is None:
+            return self
+        return getattr(obj, self.value_slot)
+
+    def __set__(self, obj, value: datetime, text: str = None):
+        """ Set the datetime, and its string when already known
+        """
+        setattr(obj, self.value_slot, value)
+        setattr(obj, self.text_slot, text)
+
+    def text(self, obj) -> str:
+        """ Return the datetime as a TIMESTAMP_FORMAT string
+        """
+        text = getattr(obj, self.text_slot)
+        if text is None:
+            text = format_timestamp(getattr(obj, self.value_slot))
+            setattr(obj, self.text_slot, text)
+        return text
+
+
+storage = None
+if getenv('MODELS_BACKEND') == 'sqlite':
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+else:
+    from models.engine.json_storage import JSONStorage
+    storage = JSONStorage()
 
 
 class Base():
     """ Base class
+
+    Objects are kept by the storage backend set as `__storage__`, the
+    JSON files by default or SQLite with MODELS_BACKEND=sqlite.
+    Subclasses can declare attributes to index in `__indexes__`:
+    equality lookups on them in `search` then skip the full scan.
+
+    Subclasses declare their attributes in `__slots__`, which keeps
+    instances compact and gives `to_json` a precomputed list of fields
+    in `__fields__`, the private ones excluded in `__public_fields__`.
+    A subclass without `__slots__` gets an instance `__dict__`, and the
+    attributes set there are serialized too, after the declared fields.
     """
 
+    __slots__ = ('id', '_created_at', '_created_at_text',
+                 '_updated_at', '_updated_at_text')
+    __fields__ = ('id', 'created_at', 'updated_at')
+    __public_fields__ = __fields__
+    __indexes__ = ()
+    __storage__ = storage
+
+    created_at = Timestamp()
+    updated_at = Timestamp()
+
+    def __init_subclass__(cls, **kwargs):
+        """ Extend the serialized fields with the slots of a subclass
+        """
+        super().__init_subclass__(**kwargs)
+        fields = tuple(cls.__dict__.get('__slots__', ()))
+        cls.__fields__ = cls.__fields__ + fields
+        cls.__public_fields__ = cls.__public_fields__ + tuple(
+            k for k in fields if k[0] != '_')
+
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a Base instance
         """
-        s_class = str(self.__class__.__name__)
-        if DATA.get(s_class) is None:
-            DATA[s_class] = {}
-
         self.id = kwargs.get('id', str(uuid.uuid4()))
-        if kwargs.get('created_at') is not None:
-            self.created_at = datetime.strptime(kwargs.get('created_at'),
-                                                TIMESTAMP_FORMAT)
-        else:
-            self.created_at = datetime.utcnow()
-        if kwargs.get('updated_at') is not None:
-            self.updated_at = datetime.strptime(kwargs.get('updated_at'),
-                                                TIMESTAMP_FORMAT)
-        else:
-            self.updated_at = datetime.utcnow()
+        for timestamp in (Base.created_at, Base.updated_at):
+            value = kwargs.get(timestamp.value_slot[1:])
+            if value is not None:
+                # only a canonical string can be reused as the text
+                text = value if is_canonical_timestamp(value) else None
+                timestamp.__set__(self, parse_timestamp(value), text)
+            else:
+                timestamp.__set__(self, datetime.utcnow())
 
     def __eq__(self, other: TypeVar('Base')) -> bool:
         """ Equality
@@ -44,15 +135,31 @@ class Base():
             return False
         return (self.id == other.id)
 
-    def to_json(self, for_serialization: bool = False) -> dict:
-        """ Convert the object a JSON dictionary
+    def to_json(self, for_serialization: bool = False,
+                fields: Iterable[str] = None) -> dict:
+        """ Convert the object a JSON dictionary, limited to the given
+            fields if any
         """
         result = {}
-        for key, value in self.__dict__.items():
-            if not for_serialization and key[0] == '_':
-                continue
+        if fields is None:
+            if for_serialization:
+                fields = self.__fields__
+            else:
+                fields = self.__public_fields__
+            # attributes of subclasses without __slots__
+            extra = getattr(self, '__dict__', None)
+            if extra:
+                fields = fields + tuple(
+                    k for k in extra
+                    if for_serialization or k[0] != '_')
+        for key in fields:
+            value = getattr(self, key, None)
             if type(value) is datetime:
-                result[key] = value.strftime(TIMESTAMP_FORMAT)
+                timestamp = getattr(type(self), key, None)
+                if isinstance(timestamp, Timestamp):
+                    result[key] = timestamp.text(self)
+                else:
+                    result[key] = format_timestamp(value)
             else:
                 result[key] = value
         return result
@@ -61,78 +168,65 @@ class Base():
     def load_from_file(cls):
         """ Load all objects from file
         """
-        s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        DATA[s_class] = {}
-        if not path.exists(file_path):
-            return
-
-        with open(file_path, 'r') as f:
-            objs_json = json.load(f)
-            for obj_id, obj_json in objs_json.items():
-                DATA[s_class][obj_id] = cls(**obj_json)
+        cls.__storage__.load(cls)
 
     @classmethod
     def save_to_file(cls):
         """ Save all objects to file
         """
-        s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        objs_json = {}
-        for obj_id, obj in DATA[s_class].items():
-            objs_json[obj_id] = obj.to_json(True)
+        cls.__storage__.dump(cls)
 
-        with open(file_path, 'w') as f:
-            json.dump(objs_json, f)
+    @classmethod
+    def refresh(cls):
+        """ Reload all objects if another process changed them
+        """
+        cls.__storage__.refresh(cls)
+
+    @classmethod
+    def flush(cls):
+        """ Persist any pending changes
+        """
+        cls.__storage__.flush()
 
     def save(self):
         """ Save current object
         """
-        s_class = self.__class__.__name__
         self.updated_at = datetime.utcnow()
-        DATA[s_class][self.id] = self
-        self.__class__.save_to_file()
+        self.__storage__.save(self)
 
     def remove(self):
         """ Remove object
         """
-        s_class = self.__class__.__name__
-        if DATA[s_class].get(self.id) is not None:
-            del DATA[s_class][self.id]
-            self.__class__.save_to_file()
+        self.__storage__.remove(self)
 
     @classmethod
     def count(cls) -> int:
         """ Count all objects
         """
-        s_class = cls.__name__
-        return len(DATA[s_class].keys())
+        return cls.__storage__.count(cls)
 
     @classmethod
     def all(cls) -> Iterable[TypeVar('Base')]:
         """ Return all objects
         """
-        return cls.search()
+        return cls.__storage__.all(cls)
+
+    @classmethod
+    def page(cls, after: str = None,
+             limit: int = None) -> List[TypeVar('Base')]:
+        """ Return at most limit objects ordered by ID, starting after
+            the ID after
+        """
+        return cls.__storage__.page(cls, after, limit)
 
     @classmethod
     def get(cls, id: str) -> TypeVar('Base'):
         """ Return one object by ID
         """
-        s_class = cls.__name__
-        return DATA[s_class].get(id)
+        return cls.__storage__.get(cls, id)
 
     @classmethod
     def search(cls, attributes: dict = {}) -> List[TypeVar('Base')]:
         """ Search all objects with matching attributes
         """
-        s_class = cls.__name__
-
-        def _search(obj):
-            if len(attributes) == 0:
-                return True
-            for k, v in attributes.items():
-                if (getattr(obj, k) != v):
-                    return False
-            return True
-
-        return list(filter(_search, DATA[s_class].values()))
+        return cls.__storage__.search(cls, attributes)
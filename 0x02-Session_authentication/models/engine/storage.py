@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+""" Storage module: interface of the storage backends of the models
+"""
+from typing import TypeVar, List, Iterable
+from bisect import bisect_right
+
+
+class Storage():
+    """ Storage class
+
+    A backend keeps the objects of every model class and persists them.
+    `Base` delegates all its storage operations to the backend set as
+    its `__storage__`.
+    """
+
+    def load(self, cls: type):
+        """ Load the objects of a class from the underlying store
+        """
+        pass
+
+    def dump(self, cls: type):
+        """ Persist all objects of a class to the underlying store
+        """
+        pass
+
+    def flush(self):
+        """ Persist any pending changes
+        """
+        pass
+
+    def refresh(self, cls: type):
+        """ Reload the objects of a class if the underlying store has
+            been changed by another process since they were loaded
+        """
+        pass
+
+    def save(self, obj: TypeVar('Base')):
+        """ Save an object
+        """
+        raise NotImplementedError
+
+    def remove(self, obj: TypeVar('Base')):
+        """ Remove an object
+        """
+        raise NotImplementedError
+
+    def count(self, cls: type) -> int:
+        """ Count all objects of a class
+        """
+        raise NotImplementedError
+
+    def get(self, cls: type, id: str) -> TypeVar('Base'):
+        """ Return one object of a class by ID
+        """
+        raise NotImplementedError
+
+    def search(self, cls: type,
+               attributes: dict) -> List[TypeVar('Base')]:
+        """ Search all objects of a class with matching attributes
+        """
+        raise NotImplementedError
+
+    def all(self, cls: type) -> Iterable[TypeVar('Base')]:
+        """ Return all objects of a class
+        """
+        return self.search(cls, {})
+
+    def page(self, cls: type, after: str = None,
+             limit: int = None) -> List[TypeVar('Base')]:
+        """ Return objects of a class ordered by ID: at most limit of
+            them, starting after the ID after
+        """
+        objs = sorted(self.all(cls), key=lambda obj: obj.id)
+        start = 0
+        if after is not None:
+            start = bisect_right([obj.id for obj in objs], after)
+        end = len(objs) if limit is None else start + limit
+        return objs[start:end]
+
+    @staticmethod
+    def matches(obj: TypeVar('Base'), attributes: dict) -> bool:
+        """ Check if an object has all the given attribute values
+        """
+        for k, v in attributes.items():
+            if (getattr(obj, k) != v):
+                return False
+        return True
@@ -8,6 +8,9 @@ class UserSession(Base):
     """ UserSession class
     """
 
+    __slots__ = ('user_id', 'session_id')
+    __indexes__ = ('session_id',)
+
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a UserSession instance
         """
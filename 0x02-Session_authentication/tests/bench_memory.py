@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+""" Memory benchmark: bytes per User and UserSession instance
+
+Usage: python3 -m tests.bench_memory [count]
+"""
+import sys
+import tracemalloc
+from models.user import User
+from models.user_session import UserSession
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+stamp = "2024-01-15T15:38:00"
+
+for cls, fields in ((User, ('email', 'first_name', 'last_name')),
+                    (UserSession, ('user_id', 'session_id'))):
+    # values are built before tracing: only the instances are measured
+    values = [{k: "{}-{}".format(k, i) for k in fields}
+              for i in range(count)]
+    tracemalloc.start()
+    objs = [cls(created_at=stamp, updated_at=stamp, **kwargs)
+            for kwargs in values]
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{:<12} {:>6} bytes/object".format(cls.__name__, size // count))
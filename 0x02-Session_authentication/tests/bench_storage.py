@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+""" Storage benchmark: JSON files against SQLite
+
+Usage: python3 -m tests.bench_storage [size ...]
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from models.engine.json_storage import JSONStorage
+from models.engine.sqlite_storage import SQLiteStorage
+from models.user import User
+
+sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 100000, 1000000]
+lookups = 1000
+writes = 10
+
+
+def timed(label, count, fn):
+    """ Print the mean time of count calls of fn """
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print("  {:<8} {:>12.1f} us/op".format(label, elapsed / count * 1e6))
+
+
+def populate_json(size):
+    """ Write a .db_User.json file of size users """
+    with open(".db_User.json", 'w') as f:
+        json.dump({str(i): {"id": str(i), "email": "{}@hbtn.io".format(i),
+                            "created_at": "2024-01-15T15:38:00",
+                            "updated_at": "2024-01-15T15:38:00"}
+                   for i in range(size)}, f)
+
+
+def populate_sqlite(storage, size):
+    """ Insert size users in the User table of storage """
+    storage.load(User)
+    with sqlite3.connect(storage.db_path) as connection:
+        connection.executemany(
+            'INSERT INTO "User" (id, data, email) VALUES (?, ?, ?)',
+            ((str(i), json.dumps({"id": str(i),
+                                  "email": "{}@hbtn.io".format(i),
+                                  "created_at": "2024-01-15T15:38:00",
+                                  "updated_at": "2024-01-15T15:38:00"}),
+              "{}@hbtn.io".format(i)) for i in range(size)))
+
+
+os.chdir(tempfile.mkdtemp())
+for size in sizes:
+    for name in ('json', 'sqlite'):
+        print("{} users, {}".format(size, name))
+        if name == 'json':
+            populate_json(size)
+            User.__storage__ = JSONStorage()
+        else:
+            User.__storage__ = SQLiteStorage("bench_{}.sqlite3".format(size))
+            populate_sqlite(User.__storage__, size)
+
+        timed('load', 1, lambda i: User.load_from_file())
+        timed('get', lookups, lambda i: User.get(str(i % size)))
+        timed('search', lookups,
+              lambda i: User.search({'email': "{}@hbtn.io".format(i % size)}))
+        timed('count', lookups, lambda i: User.count())
+        timed('save', writes, lambda i: User(email="new@hbtn.io").save())
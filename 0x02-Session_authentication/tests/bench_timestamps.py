@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+""" Timestamp benchmark: load_from_file and to_json at 100k users
+
+Usage: python3 -m tests.bench_timestamps [size]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from models.base import TIMESTAMP_FORMAT, format_timestamp, parse_timestamp
+from models.user import User
+
+size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+stamp = "2024-01-15T15:38:00"
+
+
+def timed(label, count, fn):
+    """ Print the total time of count calls of fn """
+    start = time.perf_counter()
+    for i in range(count):
+        fn()
+    elapsed = time.perf_counter() - start
+    print("{:<24} {:>10.3f} s".format(label, elapsed))
+
+
+now = datetime.utcnow()
+timed('strptime', size, lambda: datetime.strptime(stamp, TIMESTAMP_FORMAT))
+timed('parse_timestamp', size, lambda: parse_timestamp(stamp))
+timed('strftime', size, lambda: now.strftime(TIMESTAMP_FORMAT))
+timed('format_timestamp', size, lambda: format_timestamp(now))
+
+os.chdir(tempfile.mkdtemp())
+with open(".db_User.json", 'w') as f:
+    json.dump({str(i): {"id": str(i), "email": "{}@hbtn.io".format(i),
+                        "created_at": stamp, "updated_at": stamp}
+               for i in range(size)}, f)
+
+timed('load_from_file', 1, User.load_from_file)
+users = User.all()
+timed('to_json, parsed', 1, lambda: [u.to_json() for u in users])
+for user in users:
+    user.updated_at = now
+timed('to_json, updated', 1, lambda: [u.to_json() for u in users])
+timed('to_json, cached', 1, lambda: [u.to_json() for u in users])
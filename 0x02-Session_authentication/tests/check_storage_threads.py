@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+""" Threaded storage check: concurrent saves must all survive a reload,
+    in file mode and in journal mode with frequent compactions
+
+Usage: python3 -m tests.check_storage_threads [threads] [saves]
+"""
+import os
+import sys
+import tempfile
+import threading
+from models.engine.json_storage import JSONStorage
+from models.user import User
+
+threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+saves = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+
+
+def save_users(count):
+    """ Save count new users """
+    for i in range(count):
+        User(email="{}@hbtn.io".format(i)).save()
+
+
+# switch threads as often as possible, to widen the race windows
+sys.setswitchinterval(1e-6)
+os.chdir(tempfile.mkdtemp())
+for mode in ('file', 'journal'):
+    for name in os.listdir('.'):
+        os.remove(name)
+    os.environ['MODELS_STORAGE'] = mode
+    os.environ['MODELS_JOURNAL_COMPACT_SIZE'] = '50'
+    User.__storage__ = JSONStorage()
+    User.load_from_file()
+
+    workers = [threading.Thread(target=save_users, args=(saves,))
+               for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    in_memory = User.count()
+
+    User.__storage__ = JSONStorage()
+    User.load_from_file()
+    print("{:<8} saved {}, in memory {}, reloaded {}: {}".format(
+        mode, threads * saves, in_memory, User.count(),
+        'OK' if User.count() == threads * saves else 'LOST'))